@@ -201,45 +201,44 @@ class NormalFormAnalyzer:
         return NormalForm.FOURTH_NF, all_violations
 
     def get_analysis_report(self) -> str:
-        report = f"Анализ отношения: {self.relation.name}\n"
-        report += "=" * 50 + "\n\n"
+        parts = [f"Анализ отношения: {self.relation.name}\n", "=" * 50 + "\n\n"]
 
         # Атрибуты
-        report += "Атрибуты:\n"
+        parts.append("Атрибуты:\n")
         for attr in self.relation.attributes:
-            report += f"  - {attr.name} ({attr.data_type})"
+            parts.append(f"  - {attr.name} ({attr.data_type})")
             if attr.is_primary_key:
-                report += " [PK]"
-            report += "\n"
+                parts.append(" [PK]")
+            parts.append("\n")
 
         # Функциональные зависимости
-        report += f"\nФункциональные зависимости ({len(self.relation.functional_dependencies)}):\n"
+        parts.append(f"\nФункциональные зависимости ({len(self.relation.functional_dependencies)}):\n")
         for fd in self.relation.functional_dependencies:
-            report += f"  - {fd}\n"
+            parts.append(f"  - {fd}\n")
 
         # Многозначные зависимости
         if self.relation.multivalued_dependencies:
-            report += f"\nМногозначные зависимости ({len(self.relation.multivalued_dependencies)}):\n"
+            parts.append(f"\nМногозначные зависимости ({len(self.relation.multivalued_dependencies)}):\n")
             for mvd in self.relation.multivalued_dependencies:
-                report += f"  - {mvd}\n"
+                parts.append(f"  - {mvd}\n")
 
         # Ключи
-        report += f"\nКандидатные ключи ({len(self.candidate_keys)}):\n"
+        parts.append(f"\nКандидатные ключи ({len(self.candidate_keys)}):\n")
         for key in self.candidate_keys:
             key_str = ", ".join([a.name for a in key])
-            report += f"  - {{{key_str}}}\n"
+            parts.append(f"  - {{{key_str}}}\n")
 
         # Простые и непростые атрибуты
-        report += f"\nПростые атрибуты: {{{', '.join([a.name for a in self.prime_attributes])}}}\n"
-        report += f"Непростые атрибуты: {{{', '.join([a.name for a in self.non_prime_attributes])}}}\n"
+        parts.append(f"\nПростые атрибуты: {{{', '.join([a.name for a in self.prime_attributes])}}}\n")
+        parts.append(f"Непростые атрибуты: {{{', '.join([a.name for a in self.non_prime_attributes])}}}\n")
 
         # Определение нормальной формы
         nf, violations = self.determine_normal_form()
-        report += f"\nТекущая нормальная форма: {nf.value}\n"
+        parts.append(f"\nТекущая нормальная форма: {nf.value}\n")
 
         if violations:
-            report += "\nНарушения:\n"
+            parts.append("\nНарушения:\n")
             for v in violations:
-                report += f"  - {v}\n"
+                parts.append(f"  - {v}\n")
 
-        return report
\ No newline at end of file
+        return "".join(parts)
@@ -5,7 +5,7 @@ import psycopg2
 import random
 import string
 import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, TextIO
 from models import Relation, Attribute
 
 # ======================= Настройки подключения =======================
@@ -250,12 +250,14 @@ def insert_random_data(conn, rel: Relation, num_rows: int):
     conn.commit()
 
 
-def create_and_populate_normalized(conn, orig_rel: Relation, normalized: List[Relation]):
+def create_and_populate_normalized(conn, orig_rel: Relation, normalized: List[Relation],
+                                   out: Optional[TextIO] = None):
     """
     Для каждого отношения из normalized:
     1. Создать таблицу
     2. Заполнить из исходной таблицы: вставить DISTINCT строки по проекции атрибутов
     3. Добавить индексы для производительности
+    Лог пишется в out (по умолчанию sys.stdout).
     """
     # Сначала создаем все таблицы
     for rel in normalized:
@@ -268,7 +270,7 @@ def create_and_populate_normalized(conn, orig_rel: Relation, normalized: List[Re
             col_def = f"{attr.name} {sql_type_for(attr)}"
             columns_sql.append(col_def)
         create_sql = f"CREATE TABLE {rel.name} (\n    " + ",\n    ".join(columns_sql) + "\n);"
-        print(f"[SQL-CREATE-NORM] {create_sql}")
+        print(f"[SQL-CREATE-NORM] {create_sql}", file=out)
         with conn.cursor() as cur:
             cur.execute(create_sql)
         conn.commit()
@@ -297,8 +299,8 @@ def create_and_populate_normalized(conn, orig_rel: Relation, normalized: List[Re
                 if attr in existing_columns:
                     valid_attrs.append(attr)
                 else:
-                    print(f"[WARNING] Столбец {attr} не найден в таблице {orig_rel.name}")
-                    print(f"[DEBUG] Доступные столбцы: {list(existing_columns)}")
+                    print(f"[WARNING] Столбец {attr} не найден в таблице {orig_rel.name}", file=out)
+                    print(f"[DEBUG] Доступные столбцы: {list(existing_columns)}", file=out)
             
             if valid_attrs:
                 # Используем кавычки для имен столбцов и таблиц для корректной работы с кириллицей
@@ -307,16 +309,16 @@ def create_and_populate_normalized(conn, orig_rel: Relation, normalized: List[Re
                     INSERT INTO {rel.name} ({valid_col_list})
                     SELECT DISTINCT {valid_col_list} FROM "{orig_rel.name}"
                 """
-                print(f"[SQL-PROJECT] {insert_sql.strip()}")
+                print(f"[SQL-PROJECT] {insert_sql.strip()}", file=out)
                 cur.execute(insert_sql)
             else:
-                print(f"[ERROR] Нет валидных столбцов для таблицы {rel.name}")
+                print(f"[ERROR] Нет валидных столбцов для таблицы {rel.name}", file=out)
         
         conn.commit()
         
         # Отчёт о количестве строк
         cnt = count_rows(conn, rel.name)
-        print(f"[INFO] В таблице {rel.name} после проекции {cnt} строк")
+        print(f"[INFO] В таблице {rel.name} после проекции {cnt} строк", file=out)
         
         # Добавляем индексы для производительности (но не первичные ключи)
         with conn.cursor() as cur:
@@ -325,7 +327,7 @@ def create_and_populate_normalized(conn, orig_rel: Relation, normalized: List[Re
                     try:
                         index_name = f"idx_{rel.name}_{attr.name}"
                         cur.execute(f'CREATE INDEX {index_name} ON {rel.name} ("{attr.name}")')
-                        print(f"[INFO] Создан индекс {index_name}")
+                        print(f"[INFO] Создан индекс {index_name}", file=out)
                     except Exception as e:
                         # Индекс уже существует или другая ошибка - не критично
                         pass
@@ -339,11 +341,13 @@ def count_rows(conn, table_name: str) -> int:
         return cur.fetchone()[0]
 
 
-def test_decomposition(orig_rel: Relation, normalized: List[Relation], num_rows: int = 1000):
+def test_decomposition(orig_rel: Relation, normalized: List[Relation], num_rows: int = 1000,
+                       out: Optional[TextIO] = None):
     """
     1. Создать исходную таблицу orig_rel и заполнить её random-данными (num_rows строк).
     2. Создать нормализованные таблицы и заполнить их SELECT DISTINCT из original.
     3. Выполнить JOIN всех normalized таблиц, сравнить количество строк JOIN-результата с исходной.
+    Лог пишется в out (по умолчанию sys.stdout).
     """
     conn = connect()
     try:
@@ -351,17 +355,17 @@ def test_decomposition(orig_rel: Relation, normalized: List[Relation], num_rows:
         create_table(conn, orig_rel)
         insert_random_data(conn, orig_rel, num_rows)
         orig_count = count_rows(conn, orig_rel.name)
-        print(f"[INFO] Вставлено {orig_count} строк в таблицу {orig_rel.name}")
+        print(f"[INFO] Вставлено {orig_count} строк в таблицу {orig_rel.name}", file=out)
 
         # --- Шаг 2: создать и заполнить нормализованные таблицы ---
-        create_and_populate_normalized(conn, orig_rel, normalized)
+        create_and_populate_normalized(conn, orig_rel, normalized, out)
         for rel in normalized:
             cnt = count_rows(conn, rel.name)
-            print(f"[INFO] В таблице {rel.name} после проекции {cnt} строк")
+            print(f"[INFO] В таблице {rel.name} после проекции {cnt} строк", file=out)
 
         # --- Шаг 3: выполнить JOIN всех normalized таблиц ---
         if not normalized or len(normalized) < 1:
-            print("[WARNING] Нет нормализованных таблиц для проверки.")
+            print("[WARNING] Нет нормализованных таблиц для проверки.", file=out)
             return
 
         # Улучшенная логика построения JOIN'ов
@@ -382,7 +386,7 @@ def test_decomposition(orig_rel: Relation, normalized: List[Relation], num_rows:
                 # Этого не должно происходить при корректной декомпозиции,
                 # но на всякий случай оставляем CROSS JOIN
                 join_clause += f" CROSS JOIN {rel_to_join.name}"
-                print(f"[WARNING] Не найдены общие столбцы для {rel_to_join.name}. Используется CROSS JOIN.")
+                print(f"[WARNING] Не найдены общие столбцы для {rel_to_join.name}. Используется CROSS JOIN.", file=out)
             else:
                 # Ищем, с какой из уже добавленных таблиц можно соединиться
                 target_table_name = None
@@ -406,16 +410,16 @@ def test_decomposition(orig_rel: Relation, normalized: List[Relation], num_rows:
             joined_relations[rel_to_join.name] = rel_to_join
 
         join_sql = f"SELECT COUNT(*) FROM {join_clause};"
-        print(f"[SQL-JOIN] {join_sql}")
+        print(f"[SQL-JOIN] {join_sql}", file=out)
         with conn.cursor() as cur:
             cur.execute(join_sql)
             joined_count = cur.fetchone()[0]
 
-        print(f"[INFO] После JOIN всех нормализованных таблиц получено {joined_count} строк")
+        print(f"[INFO] После JOIN всех нормализованных таблиц получено {joined_count} строк", file=out)
         if joined_count == orig_count:
-            print("[SUCCESS] Декомпозиция без потерь: ROW_COUNT совпадают")
+            print("[SUCCESS] Декомпозиция без потерь: ROW_COUNT совпадают", file=out)
         else:
-            print("[ERROR] ROW_COUNT не совпадают! Исходно:", orig_count, "JOIN:", joined_count)
+            print("[ERROR] ROW_COUNT не совпадают! Исходно:", orig_count, "JOIN:", joined_count, file=out)
 
     finally:
         conn.close()
@@ -395,6 +395,8 @@ class Decomposer:
         """
         attr_set = set(attributes)
         projected_fds = []
+        # Спроецированные ФЗ по детерминанту: поиск существующей ФЗ за O(1)
+        fd_by_determinant = {}
 
         # Для каждого подмножества атрибутов проверяем, что оно определяет
         from itertools import combinations
@@ -408,17 +410,15 @@ class Decomposer:
 
                 if dependent:
                     # Проверяем минимальность
-                    is_minimal = True
-                    for existing_fd in projected_fds:
-                        if (existing_fd.determinant == det_set and
-                                existing_fd.dependent.issubset(dependent)):
-                            # Расширяем существующую ФЗ
-                            existing_fd.dependent.update(dependent)
-                            is_minimal = False
-                            break
-
-                    if is_minimal:
-                        projected_fds.append(FunctionalDependency(det_set, dependent))
+                    det_key = frozenset(det_set)
+                    existing_fd = fd_by_determinant.get(det_key)
+                    if existing_fd is not None and existing_fd.dependent.issubset(dependent):
+                        # Расширяем существующую ФЗ
+                        existing_fd.dependent.update(dependent)
+                    else:
+                        new_fd = FunctionalDependency(det_set, dependent)
+                        projected_fds.append(new_fd)
+                        fd_by_determinant.setdefault(det_key, new_fd)
 
         return projected_fds
 
@@ -3,11 +3,16 @@
 Графический интерфейс для программы автоматической нормализации реляционных БД
 """
 import io
-from contextlib import redirect_stdout
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from statistics import fmean
+from types import MappingProxyType
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
-from typing import List, Set, Optional, Tuple, Dict # Added Tuple
-import json
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+from typing import Iterable, List, Set, Optional, Tuple, Dict # Added Tuple
+from collections import defaultdict
 
 # Импорт модулей программы
 from models import (
@@ -17,15 +22,15 @@ from models import (
 from fd_algorithms import FDAlgorithms
 from analyzer import NormalFormAnalyzer
 from decomposition import Decomposer
-from visualization import VisualizationWindow, add_visualization_to_gui # MODIFIED: Added add_visualization_to_gui
-from data_test import test_decomposition, DB_PARAMS
-from performance_test import run_performance_test, plot_performance_histogram
-from memory_test import run_memory_test, plot_memory_usage
+# Модули тестов тянут psycopg2, numpy и matplotlib: импортируются при запуске теста
 
 
 
 
 class ScrollableFrame(ttk.Frame):
+    # Виджеты без дочерних элементов: обход winfo_children для них не нужен
+    _LEAF_WIDGETS = (ttk.Checkbutton, ttk.Button, ttk.Label, ttk.Entry)
+
     def __init__(self, container, *args, **kwargs):
         super().__init__(container, *args, **kwargs)
         self.canvas = tk.Canvas(self, highlightthickness=0, bd=0)
@@ -43,52 +48,70 @@ class ScrollableFrame(ttk.Frame):
             )
         )
 
-        self.canvas.create_window((0, 0), window=self.interior, anchor="nw")
+        self._interior_window = self.canvas.create_window((0, 0), window=self.interior, anchor="nw")
+        self._freeze_depth = 0
         self.canvas.configure(yscrollcommand=scrollbar.set)
 
         self.canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
+        # Накопленная прокрутка: события колеса за 25 мс сливаются
+        # в один вызов yview_scroll и одну перерисовку
+        self._pending_scroll = 0
+        self._scroll_flush_id = None
+        # Tk-пути виджетов фрейма, на которые повешена прокрутка:
+        # проверка "курсор внутри фрейма" сводится к поиску в множестве
+        self._descendants: Set[str] = {str(self), str(scrollbar)}
+
         self._bind_mouse_wheel_events(self.canvas)
         self._bind_mouse_wheel_events(self.interior)
 
-    def _on_mouse_wheel(self, event, target_canvas):
-        widget_under_mouse = self.winfo_containing(event.x_root, event.y_root)
-        if widget_under_mouse:
-            current_widget = widget_under_mouse
-            is_relevant = False
-            while current_widget:
-                if current_widget == self:  # self это ScrollableFrame
-                    is_relevant = True
-                    break
-                try:
-                    current_widget = current_widget.master
-                except AttributeError:
-                    break
-            if not is_relevant:
-                return
+    def freeze(self):
+        """Скрыть внутренний фрейм на время массовой перестройки дочерних виджетов"""
+        self._freeze_depth += 1
+        if self._freeze_depth == 1:
+            self.canvas.itemconfigure(self._interior_window, state='hidden')
+
+    def thaw(self):
+        """Показать внутренний фрейм после перестройки (вложенные freeze учитываются)"""
+        self._freeze_depth -= 1
+        if self._freeze_depth == 0:
+            self.canvas.itemconfigure(self._interior_window, state='normal')
+
+    def _queue_scroll(self, units):
+        self._pending_scroll += units
+        if self._scroll_flush_id is None:
+            self._scroll_flush_id = self.after(25, self._flush_scroll)
+
+    def _flush_scroll(self):
+        units = self._pending_scroll
+        self._pending_scroll = 0
+        self._scroll_flush_id = None
+        if units:
+            self.canvas.yview_scroll(units, "units")
+
+    def _event_targets_self(self, event) -> bool:
+        """Находится ли курсор колеса мыши над этим ScrollableFrame"""
+        if event.num in (4, 5):
+            # Button-4/5 в X11 доставляются виджету под курсором
+            widget_under_mouse = event.widget
+        else:
+            # <MouseWheel> приходит виджету с фокусом, поэтому нужен виджет под курсором
+            widget_under_mouse = self.winfo_containing(event.x_root, event.y_root)
+        if widget_under_mouse is None:
+            return True
+        return str(widget_under_mouse) in self._descendants
 
-        if event.delta == 0: return
-        target_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+    def _on_mouse_wheel(self, event, target_canvas):
+        if event.delta and self._event_targets_self(event):
+            self._queue_scroll(int(-1 * (event.delta / 120)))
 
     def _on_mouse_wheel_linux(self, event, target_canvas, direction):
-        widget_under_mouse = self.winfo_containing(event.x_root, event.y_root)
-        if widget_under_mouse:
-            current_widget = widget_under_mouse
-            is_relevant = False
-            while current_widget:
-                if current_widget == self:  # self это ScrollableFrame
-                    is_relevant = True
-                    break
-                try:
-                    current_widget = current_widget.master
-                except AttributeError:
-                    break
-            if not is_relevant:
-                return
-        target_canvas.yview_scroll(direction, "units")
+        if self._event_targets_self(event):
+            self._queue_scroll(direction)
 
     def _bind_mouse_wheel_events(self, widget_to_bind):
+        self._descendants.add(str(widget_to_bind))
         widget_to_bind.bind("<MouseWheel>",
                             lambda e: self._on_mouse_wheel(e, self.canvas), add="+")
         # Для Linux
@@ -98,9 +121,120 @@ class ScrollableFrame(ttk.Frame):
                             lambda e: self._on_mouse_wheel_linux(e, self.canvas, 1), add="+")
 
     def bind_child_for_scrolling(self, child_widget):
-        self._bind_mouse_wheel_events(child_widget)
-        for child in child_widget.winfo_children():
-            self.bind_child_for_scrolling(child)
+        # Обход в глубину через явный стек вместо рекурсии
+        stack = [child_widget]
+        while stack:
+            widget = stack.pop()
+            if str(widget) in self._descendants:
+                continue
+            self._bind_mouse_wheel_events(widget)
+            if not isinstance(widget, self._LEAF_WIDGETS):
+                stack.extend(widget.winfo_children())
+
+
+# Описания типов запросов для отчета о производительности
+QUERY_DESCRIPTIONS = MappingProxyType({
+    'full_scan': 'Полное сканирование таблицы',
+    'pk_lookup': 'Поиск записи по первичному ключу',
+    'aggregation': 'Агрегация данных (COUNT)',
+    'group_by': 'Группировка данных',
+    'filter_non_indexed': 'Фильтрация по неиндексированному полю',
+    'full_join': 'Полное соединение всех таблиц',
+    'join_with_filter': 'JOIN с условием фильтрации',
+    'single_table': 'Запрос к одной таблице',
+    'join_aggregation': 'Агрегация после JOIN',
+    'subquery': 'Запрос с подзапросом'
+})
+
+# Разделители строк в текстовых отчетах
+SEP_EQ_50 = "=" * 50 + "\n"
+SEP_EQ_60 = "=" * 60 + "\n"
+SEP_EQ_70 = "=" * 70 + "\n"
+SEP_EQ_80 = "=" * 80 + "\n"
+SEP_DASH_40 = "-" * 40 + "\n"
+SEP_DASH_70 = "-" * 70 + "\n"
+SEP_DASH_80 = "-" * 80 + "\n"
+
+# Текстовые поля отчетов только отображают результат: стек отмены им не нужен
+_REPORT_TEXT_OPTIONS = dict(undo=False, maxundo=0, autoseparators=False)
+
+# Атрибуты примера: имена, типы и признаки PK параллельными кортежами.
+# В классическом примере Сотр(КодСотр, ...) Проект(КодПроекта,...) Связь(КодСотр, КодПроекта, Часы)
+# здесь это одно отношение, так что PK могут быть оба
+_EXAMPLE_ATTR_NAMES = ("КодСотрудника", "ИмяСотрудника", "Отдел", "НачальникОтдела",
+                       "КодПроекта", "НазваниеПроекта", "Бюджет")
+_EXAMPLE_ATTR_TYPES = ("INTEGER", "VARCHAR", "VARCHAR", "VARCHAR",
+                       "INTEGER", "VARCHAR", "DECIMAL")
+_EXAMPLE_ATTR_PKS = (True, False, False, False,
+                     True, False, False)
+
+# ФЗ примера: (имена детерминанта, имена зависимой части)
+_EXAMPLE_FDS = (
+    (("КодСотрудника",), ("ИмяСотрудника", "Отдел")),  # КодСотрудника → ИмяСотрудника, Отдел
+    (("Отдел",), ("НачальникОтдела",)),                # Отдел → НачальникОтдела
+    (("КодПроекта",), ("НазваниеПроекта", "Бюджет")),  # КодПроекта → НазваниеПроекта, Бюджет
+)
+
+_EXAMPLE_INFO = ("Загружен пример отношения. \n"
+                 "Возможные нарушения: \n"
+                 "- 2НФ, если (КодСотрудника, КодПроекта) ключ, а есть зависимости от частей ключа.\n"
+                 "- 3НФ из-за транзитивной зависимости Отдел -> НачальникОтдела (КодСотрудника -> Отдел -> НачальникОтдела).")
+
+_ABOUT_TEXT = """Программа автоматической нормализации реляционных БД
+
+Версия: 1.1
+Автор: Зуев Тимофей, ИУ7-85Б ()
+
+Программа позволяет:
+- Вводить атрибуты и функциональные зависимости
+- Анализировать нормальные формы отношений (1НФ, 2НФ, 3НФ, НФБК, 4НФ)
+- Выполнять декомпозицию в 2НФ, 3НФ, НФБК и 4НФ
+- Проверять сохранение функциональных зависимостей
+- Генерировать SQL DDL для результирующих отношений
+- Визуализировать схемы отношений (исходное и результат декомпозиции)
+
+Используемые алгоритмы:
+- Алгоритм синтеза для 3НФ
+- Алгоритм декомпозиции для НФБК
+- Вычисление замыкания атрибутов
+- Поиск минимального покрытия ФЗ
+- Алгоритмы проверки нормальных форм"""
+
+
+class _TkSink(io.TextIOBase):
+    """Приемник лога: копит вывод и порциями дописывает его в Tk-виджет через главный поток"""
+
+    def __init__(self, root, text_widget, limit: int = 64 << 10):
+        self._root = root
+        self._txt = text_widget
+        self._limit = limit
+        self._buf: List[str] = []
+        self._size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, s):
+        self._buf.append(s)
+        self._size += len(s)
+        if self._size > self._limit:
+            self.flush()
+        return len(s)
+
+    def flush(self):
+        if not self._buf:
+            return
+        chunk = "".join(self._buf)
+        self._buf.clear()
+        self._size = 0
+        self._root.after(0, self._append, chunk)
+
+    def _append(self, chunk: str):
+        if not self._txt.winfo_exists():
+            return
+        self._txt.configure(state="normal")
+        self._txt.insert(tk.END, chunk)
+        self._txt.configure(state="disabled")
 
 
 class NormalizationGUI:
@@ -111,10 +245,29 @@ class NormalizationGUI:
 
         # Данные
         self.attributes: List[Attribute] = []
+        # Имена атрибутов для проверки уникальности за O(1)
+        self._attr_names: Set[str] = set()
         self.functional_dependencies: List[FunctionalDependency] = []
         self.multivalued_dependencies: List[MultivaluedDependency] = []
+        # Обратные индексы: атрибут -> id() использующих его ФЗ / МЗД
+        self._attr_to_fds: Dict[Attribute, Set[int]] = defaultdict(set)
+        self._attr_to_mvds: Dict[Attribute, Set[int]] = defaultdict(set)
+        # Ключи (детерминант, зависимая часть) для проверки дубликатов за O(1)
+        self._fd_keys: Set[Tuple[frozenset, frozenset]] = set()
+        self._mvd_keys: Set[Tuple[frozenset, frozenset]] = set()
+        # Канонические frozenset наборов атрибутов: равные ключи совпадают по identity
+        self._frozenset_intern: Dict[frozenset, frozenset] = {}
         self.current_relation: Optional[Relation] = None
+        # Атрибуты или зависимости менялись после построения current_relation
+        self._inputs_dirty = True
         self.normalization_result: Optional[NormalizationResult] = None
+        # Результаты анализа результирующих отношений:
+        # (кандидатные ключи, нормальная форма, ключи в виде строки для отчета)
+        self._per_rel_analysis: List[Tuple[Tuple[frozenset, ...], NormalForm, str]] = []
+        # DDL текущего результата нормализации (сбрасывается при его смене)
+        self._cached_sql: Optional[str] = None
+        # Анализаторы результирующих отношений по сигнатуре отношения
+        self._analyzer_cache: Dict[tuple, NormalFormAnalyzer] = {}
 
         self.db_host_var = tk.StringVar(value="")
         self.db_port_var = tk.StringVar(value="")
@@ -133,31 +286,104 @@ class NormalizationGUI:
         # MODIFIED: Data for FD checkboxes
         self.determinant_vars: List[Tuple[Attribute, tk.BooleanVar]] = []
         self.dependent_vars: List[Tuple[Attribute, tk.BooleanVar]] = []
+        # Пулы чекбоксов по имени атрибута: виджеты переиспользуются при перестройке
+        self._det_cb_pool: Dict[str, Tuple[ttk.Checkbutton, tk.BooleanVar]] = {}
+        self._dep_cb_pool: Dict[str, Tuple[ttk.Checkbutton, tk.BooleanVar]] = {}
+        # Имена атрибутов, чьи чекбоксы сейчас упакованы, в порядке отображения
+        self._det_cb_packed: List[str] = []
+        self._dep_cb_packed: List[str] = []
+
+        # Фоновые потоки для тяжелых вычислений (анализ, декомпозиция),
+        # чтобы главный поток Tk оставался отзывчивым
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        # Отдельный пул для долгих тестов с БД: они не занимают потоки,
+        # нужные интерактивным действиям
+        self._db_executor = ThreadPoolExecutor(max_workers=2)
+
+        # При массовой загрузке списки обновляются одним вызовом insert в конце
+        self._defer_listbox_updates = False
+        # При массовом изменении атрибутов чекбоксы ФЗ перестраиваются один раз в конце
+        self._fd_cb_updates_suspended = False
+        self._fd_cb_update_pending = False
+        # Незавершенные порционные вставки текста: путь виджета -> id after
+        self._stream_jobs: Dict[str, str] = {}
+        # Поля отчетов: имя атрибута -> (родитель, параметры) для пересоздания
+        self._report_text_specs: Dict[str, Tuple[tk.Widget, dict]] = {}
 
 
         # Создание интерфейса
         self.create_menu()
         self.create_widgets()
 
-    def make_text_readonly_but_copyable(self, text_widget):
+    @staticmethod
+    def _dependency_key(dependency) -> Tuple[frozenset, frozenset]:
+        """Хешируемый ключ ФЗ/МЗД для проверки дубликатов"""
+        return frozenset(dependency.determinant), frozenset(dependency.dependent)
+
+    @staticmethod
+    def _index_dependency(index: Dict[Attribute, Set[int]], dependency):
+        """Добавить ФЗ/МЗД в обратный индекс атрибут -> id зависимостей"""
+        for attr in dependency.determinant | dependency.dependent:
+            index[attr].add(id(dependency))
+
+    @staticmethod
+    def _unindex_dependency(index: Dict[Attribute, Set[int]], dependency):
+        """Убрать ФЗ/МЗД из обратного индекса, удаляя опустевшие записи"""
+        for attr in dependency.determinant | dependency.dependent:
+            dep_ids = index.get(attr)
+            if dep_ids is not None:
+                dep_ids.discard(id(dependency))
+                if not dep_ids:
+                    del index[attr]
+
+    def _intern(self, fs: frozenset) -> frozenset:
+        """Вернуть канонический экземпляр frozenset"""
+        return self._frozenset_intern.setdefault(fs, fs)
+
+    def _interned_key(self, dependency) -> Tuple[frozenset, frozenset]:
+        """Ключ ФЗ/МЗД из интернированных наборов атрибутов"""
+        return (self._intern(frozenset(dependency.determinant)),
+                self._intern(frozenset(dependency.dependent)))
+
+    @classmethod
+    def _relation_signature(cls, rel: Relation) -> tuple:
+        """Хешируемая сигнатура отношения: имя, атрибуты с типами и PK, ФЗ и МЗД"""
+        # Атрибуты сравниваются только по имени, а отчет анализа выводит и тип, и PK
+        return (rel.name,
+                frozenset((a.name, a.data_type, a.is_primary_key) for a in rel.attributes),
+                frozenset(cls._dependency_key(fd) for fd in rel.functional_dependencies),
+                frozenset(cls._dependency_key(mvd) for mvd in rel.multivalued_dependencies))
+
+    @staticmethod
+    def _get_pk(rel: Relation, candidate_keys) -> Set[Attribute]:
         """
-        Делает текстовый виджет доступным только для чтения, но с возможностью копирования
+        Первичный ключ таблицы: явно отмеченные PK-атрибуты, если они образуют суперключ,
+        иначе первый кандидатный ключ
         """
+        explicit_pk = {a for a in rel.attributes if a.is_primary_key}
+        if explicit_pk and FDAlgorithms.is_superkey(explicit_pk, rel):
+            return explicit_pk
+        return set(candidate_keys[0]) if candidate_keys else set()
+
+    def _get_analyzer(self, rel: Relation) -> NormalFormAnalyzer:
+        """Анализатор отношения из кэша (создается при первом обращении)"""
+        signature = self._relation_signature(rel)
+        analyzer = self._analyzer_cache.get(signature)
+        if analyzer is None:
+            analyzer = self._analyzer_cache[signature] = NormalFormAnalyzer(rel)
+        return analyzer
 
-        # Биндим события для предотвращения редактирования
-        def prevent_edit(event):
-            if event.keysym not in ['Up', 'Down', 'Left', 'Right', 'Home', 'End',
-                                    'Prior', 'Next', 'Control_L', 'Control_R',
-                                    'c', 'C', 'a', 'A']:
-                if not (event.state & 0x4):  # Не Ctrl
-                    return "break"
-
-        text_widget.bind("<Key>", prevent_edit)
-        text_widget.bind("<Button-2>", lambda e: "break")  # Запрет вставки средней кнопкой мыши
+    def make_text_readonly_but_copyable(self, text_widget):
+        """
+        Делает текстовый виджет доступным только для чтения, но с возможностью копирования.
+        Вызывается после вставки содержимого.
+        """
+        # Редактирование запрещает сам Tk, без Python-обработчика на каждую клавишу
+        text_widget.configure(state='disabled')
 
-        # Разрешаем выделение и копирование
-        text_widget.bind("<Control-c>", lambda e: None)
-        text_widget.bind("<Control-a>", lambda e: text_widget.tag_add("sel", "1.0", "end"))
+        # Выключенный виджет не получает фокус по щелчку, а без фокуса не работают Ctrl+C/Ctrl+A
+        text_widget.bind("<Button-1>", lambda e: text_widget.focus_set())
+        text_widget.bind("<Control-a>", lambda e: (text_widget.tag_add("sel", "1.0", "end"), "break")[-1])
 
         # Устанавливаем курсор для индикации что текст можно выделять
         text_widget.config(cursor="arrow")
@@ -178,7 +404,8 @@ class NormalizationGUI:
         text_widget = scrolledtext.ScrolledText(
             text_frame,
             wrap=tk.WORD,
-            font=("Courier", 9)
+            font=("Courier", 9),
+            **_REPORT_TEXT_OPTIONS
         )
         text_widget.pack(fill='both', expand=True)
 
@@ -194,8 +421,8 @@ class NormalizationGUI:
 
         # Кнопка копирования всего текста
         def copy_all():
-            text_widget.tag_add("sel", "1.0", "end")
-            text_widget.event_generate("<<Copy>>")
+            self.root.clipboard_clear()
+            self.root.clipboard_append(content)
             # Показываем уведомление
             copy_label = ttk.Label(button_frame, text="Скопировано в буфер обмена!",
                                    foreground="green")
@@ -228,24 +455,95 @@ class NormalizationGUI:
         help_menu.add_command(label="О программе", command=self.show_about)
 
     def create_widgets(self):
-        notebook = ttk.Notebook(self.root)
+        self.notebook = notebook = ttk.Notebook(self.root)
         notebook.pack(fill='both', expand=True, padx=5, pady=5)
 
         self.input_frame = ttk.Frame(notebook)
         notebook.add(self.input_frame, text="Ввод данных")
         self.create_input_widgets()
 
+        # Содержимое остальных вкладок создается при первом открытии
         self.analysis_frame = ttk.Frame(notebook)
         notebook.add(self.analysis_frame, text="Анализ")
-        self.create_analysis_widgets()
 
         self.normalization_frame = ttk.Frame(notebook)
         notebook.add(self.normalization_frame, text="Нормализация")
-        self.create_normalization_widgets()
 
         self.results_frame = ttk.Frame(notebook)
         notebook.add(self.results_frame, text="Результаты")
-        self.create_results_widgets()
+
+        self._tab_builders = {
+            str(self.analysis_frame): self.create_analysis_widgets,
+            str(self.normalization_frame): self.create_normalization_widgets,
+            str(self.results_frame): self.create_results_widgets,
+        }
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_change)
+
+    def _on_tab_change(self, event=None):
+        self._ensure_tab_built(self.notebook.select())
+
+    def _ensure_tab_built(self, tab):
+        """Создать содержимое вкладки, если оно еще не создано"""
+        builder = self._tab_builders.pop(str(tab), None)
+        if builder is not None:
+            builder()
+
+    def _make_report_text(self, name: str, parent, after=None, **options) -> scrolledtext.ScrolledText:
+        """Создать поле отчета только для чтения и сохранить его как атрибут name"""
+        widget = scrolledtext.ScrolledText(parent, wrap=tk.WORD, **options, **_REPORT_TEXT_OPTIONS)
+        pack_options = dict(fill='both', expand=True, padx=5, pady=5)
+        if after is not None:
+            pack_options['after'] = after
+        widget.pack(**pack_options)
+        self.make_text_readonly_but_copyable(widget)
+        self._report_text_specs[name] = (parent, options)
+        setattr(self, name, widget)
+        return widget
+
+    def _recreate_report_texts(self):
+        """
+        Заменить поля отчетов новыми пустыми: destroy освобождает текст целиком,
+        а delete 1.0 end проходит по всем строкам, тегам и меткам
+        """
+        for name, (parent, options) in list(self._report_text_specs.items()):
+            old = getattr(self, name)
+            pending = self._stream_jobs.pop(str(old), None)
+            if pending is not None:
+                self.root.after_cancel(pending)
+            # ScrolledText упакован через свою рамку: новое поле встает на ее место
+            self._make_report_text(name, parent, after=old.frame, **options)
+            old.frame.destroy()
+
+    def _clear_all_text(self):
+        """Очистить текстовые поля результатов (только уже созданные вкладки) одним вызовом Tcl"""
+        script = "; ".join(
+            f"{path} configure -state normal; {path} delete 1.0 end; {path} configure -state disabled"
+            for path in (str(getattr(self, name)) for name in self._report_text_specs)
+        )
+        if script:
+            self.root.tk.eval(script)
+
+    def _first_nonblank(self, *names: str) -> str:
+        """Содержимое первого непустого текстового поля; каждое читается один раз"""
+        for name in names:
+            widget = getattr(self, name, None)
+            if widget is None:
+                continue
+            # end-1c: без перевода строки, который Tk всегда держит в конце,
+            # поэтому пустое поле дает пустую строку
+            content = widget.get("1.0", "end-1c")
+            if content:
+                return content
+        return ""
+
+    @staticmethod
+    def _set_text(widget: tk.Text, content: str):
+        """Заменить содержимое текстового поля только для чтения"""
+        widget.configure(state='normal')
+        widget.delete(1.0, tk.END)
+        if content:
+            widget.insert(1.0, content)
+        widget.configure(state='disabled')
 
     def create_input_widgets(self):
         name_frame = ttk.LabelFrame(self.input_frame, text="Отношение", padding=10)
@@ -335,11 +633,11 @@ class NormalizationGUI:
         control_frame = ttk.Frame(self.analysis_frame)
         control_frame.pack(fill='x', padx=5, pady=5)
 
-        ttk.Button(control_frame, text="Выполнить анализ",
-                   command=self.perform_analysis, style='Accent.TButton').pack(pady=10)
+        self.analysis_button = ttk.Button(control_frame, text="Выполнить анализ",
+                                          command=self.perform_analysis, style='Accent.TButton')
+        self.analysis_button.pack(pady=10)
 
-        self.analysis_text = scrolledtext.ScrolledText(self.analysis_frame, wrap=tk.WORD, height=25)
-        self.analysis_text.pack(fill='both', expand=True, padx=5, pady=5)
+        self._make_report_text('analysis_text', self.analysis_frame, height=25)
 
     def create_normalization_widgets(self):
         control_frame = ttk.LabelFrame(self.normalization_frame, text="Параметры нормализации", padding=10)
@@ -351,11 +649,11 @@ class NormalizationGUI:
         nf_combo['values'] = ['2НФ', '3НФ', 'НФБК', '4НФ']
         nf_combo.pack(side='left', padx=5)
 
-        ttk.Button(control_frame, text="Выполнить нормализацию",
-                   command=self.perform_normalization, style='Accent.TButton').pack(side='left', padx=20)
+        self.normalization_button = ttk.Button(control_frame, text="Выполнить нормализацию",
+                                               command=self.perform_normalization, style='Accent.TButton')
+        self.normalization_button.pack(side='left', padx=20)
 
-        self.normalization_text = scrolledtext.ScrolledText(self.normalization_frame, wrap=tk.WORD, height=20)
-        self.normalization_text.pack(fill='both', expand=True, padx=5, pady=5)
+        self._make_report_text('normalization_text', self.normalization_frame, height=20)
 
     def create_results_widgets(self):
         export_frame = ttk.Frame(self.results_frame)
@@ -408,75 +706,202 @@ class NormalizationGUI:
                    command=self.export_to_sql).pack(side='left', padx=5)
         ttk.Button(export_frame, text="Сохранить отчет",
                    command=self.save_report).pack(side='left', padx=5)
+        # Модуль визуализации подключается при первом открытии окна
+        ttk.Button(export_frame, text="Визуализация схемы",
+                   command=self._open_visualization).pack(side='left', padx=5)
 
 
 
 
-        self.results_text = scrolledtext.ScrolledText(self.results_frame, wrap=tk.WORD)
-        self.results_text.pack(fill='both', expand=True, padx=5, pady=5)
+        self._make_report_text('results_text', self.results_frame)
 
-        if hasattr(self, 'create_visualization_button'):
-            self.create_visualization_button()
-        else:
-            print("Warning: Visualization tools not loaded.")
+    def _ensure_visualization(self):
+        """Подключить функции визуализации к классу при первом обращении"""
+        cls = type(self)
+        if not getattr(cls, '_viz_patched', False):
+            from visualization import add_visualization_to_gui
+            add_visualization_to_gui(cls)
+            cls._viz_patched = True
 
+    def _open_visualization(self):
+        """Открыть окно визуализации схемы"""
+        self._ensure_visualization()
+        self.show_visualization()
+
+
+    @contextmanager
+    def _frozen_ui(self):
+        """
+        Скрыть чекбоксы ФЗ на время массового изменения: пока они не отображаются,
+        перестройка и переключение переменных не вызывают перерисовок
+        """
+        frames = (self.determinant_cb_frame_scrollable, self.dependent_cb_frame_scrollable)
+        for frame in frames:
+            frame.freeze()
+        try:
+            yield
+        finally:
+            for frame in frames:
+                frame.thaw()
+
+    @contextmanager
+    def _bulk_attribute_edit(self):
+        """Отложить перестройку чекбоксов ФЗ до конца блока"""
+        if self._fd_cb_updates_suspended:
+            # Вложенный блок: перестройку выполнит внешний
+            yield
+            return
+        self._fd_cb_updates_suspended = True
+        try:
+            yield
+        finally:
+            self._fd_cb_updates_suspended = False
+            if self._fd_cb_update_pending:
+                self._fd_cb_update_pending = False
+                self._update_fd_attribute_checkboxes()
 
     def _update_fd_attribute_checkboxes(self):
         """Обновляет чекбоксы для выбора атрибутов ФЗ и МЗД."""
-        for widget in self.determinant_cb_frame.winfo_children():
-            widget.destroy()
-        for widget in self.dependent_cb_frame.winfo_children():
-            widget.destroy()
+        if self._fd_cb_updates_suspended:
+            self._fd_cb_update_pending = True
+            return
+        self._fd_cb_update_pending = False
+
+        # Пока фреймы скрыты, Tk не пересчитывает геометрию на каждый виджет
+        self.determinant_cb_frame_scrollable.freeze()
+        self.dependent_cb_frame_scrollable.freeze()
+
+        self._sync_checkbox_pool(self._det_cb_pool, self._det_cb_packed,
+                                 self.determinant_cb_frame_scrollable, self.determinant_vars)
+        self._sync_checkbox_pool(self._dep_cb_pool, self._dep_cb_packed,
+                                 self.dependent_cb_frame_scrollable, self.dependent_vars)
+
+        # scrollregion пересчитает обработчик <Configure> внутреннего фрейма
+        # один раз после возврата в цикл событий
+        self.determinant_cb_frame_scrollable.thaw()
+        self.dependent_cb_frame_scrollable.thaw()
+
+    def _sync_checkbox_pool(self, pool: Dict[str, Tuple[ttk.Checkbutton, tk.BooleanVar]],
+                            packed: List[str],
+                            scrollable: ScrollableFrame,
+                            attr_vars: List[Tuple[Attribute, tk.BooleanVar]]):
+        """
+        Привести пул чекбоксов к текущему списку атрибутов: скрываются только удаленные,
+        создаются и упаковываются только новые
+        """
+        names = [attr.name for attr in self.attributes]
+        names_set = set(names)
+        kept = [name for name in packed if name in names_set]
+
+        if kept == names[:len(kept)]:
+            # Атрибуты удалены и/или добавлены в конец: порядок оставшихся не меняется
+            for name in packed:
+                if name not in names_set:
+                    pool[name][0].pack_forget()
+            to_pack = names[len(kept):]
+        else:
+            for name in packed:
+                pool[name][0].pack_forget()
+            to_pack = names
+
+        for name in to_pack:
+            entry = pool.get(name)
+            if entry is None:
+                # Новый чекбокс создается и привязывается к прокрутке один раз
+                var = tk.BooleanVar()
+                cb = ttk.Checkbutton(scrollable.interior, text=name, variable=var)
+                scrollable.bind_child_for_scrolling(cb)
+                entry = pool[name] = (cb, var)
+            entry[0].pack(anchor='w', padx=2)
+        packed[:] = names
+
+        attr_vars.clear()
+        for attr in self.attributes:
+            var = pool[attr.name][1]
+            var.set(False)
+            attr_vars.append((attr, var))
 
-        self.determinant_vars.clear()
-        self.dependent_vars.clear()
+    @staticmethod
+    def _attribute_list_text(attr: Attribute) -> str:
+        list_text = f"{attr.name} ({attr.data_type})"
+        if attr.is_primary_key:
+            list_text += " [PK]"
+        return list_text
+
+    @contextmanager
+    def _bulk_listbox_updates(self):
+        """Отложить вставки в списки атрибутов, ФЗ и МЗД и перестроить их в конце блока"""
+        if self._defer_listbox_updates:
+            yield
+            return
+        self._defer_listbox_updates = True
+        try:
+            yield
+        finally:
+            self._defer_listbox_updates = False
+            self._refresh_attr_listbox()
+            self._refresh_fd_listbox()
+            self._refresh_mvd_listbox()
+
+    def _refresh_attr_listbox(self):
+        """Перестроить список атрибутов одним вызовом insert"""
+        self.attr_listbox.delete(0, tk.END)
+        if self.attributes:
+            self.attr_listbox.insert(tk.END, *[self._attribute_list_text(a) for a in self.attributes])
+
+    def _refresh_fd_listbox(self):
+        """Перестроить список ФЗ одним вызовом insert"""
+        self.fd_listbox.delete(0, tk.END)
+        if self.functional_dependencies:
+            self.fd_listbox.insert(tk.END, *[str(fd) for fd in self.functional_dependencies])
+
+    def _refresh_mvd_listbox(self):
+        """Перестроить список МЗД одним вызовом insert"""
+        self.mvd_listbox.delete(0, tk.END)
+        if self.multivalued_dependencies:
+            self.mvd_listbox.insert(tk.END, *[str(mvd) for mvd in self.multivalued_dependencies])
+
+    def add_attribute(self, name: Optional[str] = None, dtype: Optional[str] = None,
+                      is_pk: Optional[bool] = None, _defer_fd_refresh: bool = False):
+        # Без аргументов значения берутся из полей формы
+        from_form = name is None
+        if from_form:
+            name = self.attr_name_var.get().strip()
+        if dtype is None:
+            dtype = self.attr_type_var.get()
+        if is_pk is None:
+            is_pk = self.is_pk_var.get()
 
-        for attr in self.attributes:
-            det_var = tk.BooleanVar()
-            det_cb = ttk.Checkbutton(self.determinant_cb_frame, text=attr.name, variable=det_var)
-            det_cb.pack(anchor='w', padx=2)
-            self.determinant_vars.append((attr, det_var))
-            self.determinant_cb_frame_scrollable.bind_child_for_scrolling(det_cb)
-
-            dep_var = tk.BooleanVar()
-            dep_cb = ttk.Checkbutton(self.dependent_cb_frame, text=attr.name, variable=dep_var)
-            dep_cb.pack(anchor='w', padx=2)
-            self.dependent_vars.append((attr, dep_var))
-            self.dependent_cb_frame_scrollable.bind_child_for_scrolling(dep_cb)
-
-        self.root.update_idletasks()
-        self.determinant_cb_frame_scrollable.canvas.config(
-            scrollregion=self.determinant_cb_frame_scrollable.canvas.bbox("all"))
-        self.dependent_cb_frame_scrollable.canvas.config(
-            scrollregion=self.dependent_cb_frame_scrollable.canvas.bbox("all"))
-
-    def add_attribute(self):
-        name = self.attr_name_var.get().strip()
         if not name:
             messagebox.showwarning("Ошибка", "Введите имя атрибута")
             return
 
-        for existing_attr in self.attributes:
-            if existing_attr.name == name:
-                messagebox.showwarning("Ошибка", "Атрибут с таким именем уже существует")
-                return
+        if name in self._attr_names:
+            messagebox.showwarning("Ошибка", "Атрибут с таким именем уже существует")
+            return
 
         attr = Attribute(
             name=name,
-            data_type=self.attr_type_var.get(),
-            is_primary_key=self.is_pk_var.get()
+            data_type=dtype,
+            is_primary_key=is_pk
         )
         self.attributes.append(attr)
+        self._inputs_dirty = True
+        self._attr_names.add(name)
 
-        list_text = f"{attr.name} ({attr.data_type})"
-        if attr.is_primary_key:
-            list_text += " [PK]"
-        self.attr_listbox.insert(tk.END, list_text)
+        if not self._defer_listbox_updates:
+            self.attr_listbox.insert(tk.END, self._attribute_list_text(attr))
 
-        self._update_fd_attribute_checkboxes()
+        if _defer_fd_refresh:
+            # Перестройку выполнит следующий вызов _update_fd_attribute_checkboxes
+            # или выход из _bulk_attribute_edit
+            self._fd_cb_update_pending = True
+        else:
+            self._update_fd_attribute_checkboxes()
 
-        self.attr_name_var.set("")
-        self.is_pk_var.set(False)
+        if from_form:
+            self.attr_name_var.set("")
+            self.is_pk_var.set(False)
 
     def remove_attribute(self):
         selection = self.attr_listbox.curselection()
@@ -486,13 +911,19 @@ class NormalizationGUI:
         index = selection[0]
         attr_to_remove = self.attributes[index]
 
-        for fd in self.functional_dependencies:
-            if attr_to_remove in fd.determinant or attr_to_remove in fd.dependent:
-                messagebox.showwarning("Ошибка",
-                                       f"Атрибут '{attr_to_remove.name}' используется в функциональных зависимостях. Сначала удалите ФЗ.")
-                return
+        if self._attr_to_fds.get(attr_to_remove):
+            messagebox.showwarning("Ошибка",
+                                   f"Атрибут '{attr_to_remove.name}' используется в функциональных зависимостях. Сначала удалите ФЗ.")
+            return
+
+        if self._attr_to_mvds.get(attr_to_remove):
+            messagebox.showwarning("Ошибка",
+                                   f"Атрибут '{attr_to_remove.name}' используется в многозначных зависимостях. Сначала удалите МЗД.")
+            return
 
         self.attributes.pop(index)
+        self._inputs_dirty = True
+        self._attr_names.discard(attr_to_remove.name)
         self.attr_listbox.delete(index)
 
         self._update_fd_attribute_checkboxes()
@@ -504,21 +935,26 @@ class NormalizationGUI:
             return
 
         self.attributes.clear()
+        self._inputs_dirty = True
+        self._attr_names.clear()
         self.attr_listbox.delete(0, tk.END)
 
         self._update_fd_attribute_checkboxes()
 
 
-    def add_functional_dependency(self):
-        determinant_attrs: Set[Attribute] = set()
-        for attr, var in self.determinant_vars:
-            if var.get():
-                determinant_attrs.add(attr)
-
-        dependent_attrs: Set[Attribute] = set()
-        for attr, var in self.dependent_vars:
-            if var.get():
-                dependent_attrs.add(attr)
+    def add_functional_dependency(self, det_attrs: Optional[Iterable[Attribute]] = None,
+                                  dep_attrs: Optional[Iterable[Attribute]] = None):
+        if det_attrs is None and dep_attrs is None:
+            # Один var.get() на чекбокс; отмеченные переменные запоминаются для сброса
+            checked_det = [(attr, var) for attr, var in self.determinant_vars if var.get()]
+            checked_dep = [(attr, var) for attr, var in self.dependent_vars if var.get()]
+            determinant_attrs = {attr for attr, _ in checked_det}
+            dependent_attrs = {attr for attr, _ in checked_dep}
+        else:
+            # Атрибуты переданы явно (пакетная загрузка): чекбоксы не читаются и не сбрасываются
+            checked_det = checked_dep = ()
+            determinant_attrs = set(det_attrs or ())
+            dependent_attrs = set(dep_attrs or ())
 
         if not determinant_attrs:
             messagebox.showwarning("Ошибка", "Выберите атрибуты детерминанта")
@@ -536,19 +972,26 @@ class NormalizationGUI:
              return
 
 
-        fd = FunctionalDependency(determinant_attrs, dependent_attrs)
-
-        if any(fd.determinant == existing_fd.determinant and fd.dependent == existing_fd.dependent
-               for existing_fd in self.functional_dependencies):
+        # Выбор завершен: ФЗ хранит интернированные frozenset, они же служат ключом дубликатов
+        fd_key = (self._intern(frozenset(determinant_attrs)),
+                  self._intern(frozenset(dependent_attrs)))
+        if fd_key in self._fd_keys:
             messagebox.showwarning("Ошибка", "Такая функциональная зависимость уже существует.")
             return
 
-        self.functional_dependencies.append(fd)
-        self.fd_listbox.insert(tk.END, str(fd))
+        fd = FunctionalDependency(*fd_key)
 
-        for _, var in self.determinant_vars:
+        self.functional_dependencies.append(fd)
+        self._inputs_dirty = True
+        self._fd_keys.add(fd_key)
+        self._index_dependency(self._attr_to_fds, fd)
+        if not self._defer_listbox_updates:
+            self.fd_listbox.insert(tk.END, str(fd))
+
+        # Сбрасываются только отмеченные чекбоксы
+        for _, var in checked_det:
             var.set(False)
-        for _, var in self.dependent_vars:
+        for _, var in checked_dep:
             var.set(False)
 
     def remove_fd(self):
@@ -557,16 +1000,24 @@ class NormalizationGUI:
             return
 
         index = selection[0]
-        self.functional_dependencies.pop(index)
+        fd = self.functional_dependencies.pop(index)
+        self._inputs_dirty = True
+        self._fd_keys.discard(self._dependency_key(fd))
+        self._unindex_dependency(self._attr_to_fds, fd)
         self.fd_listbox.delete(index)
 
     def clear_fds(self):
         self.functional_dependencies.clear()
+        self._inputs_dirty = True
+        self._attr_to_fds.clear()
+        self._fd_keys.clear()
         self.fd_listbox.delete(0, tk.END)
 
     def add_multivalued_dependency(self):
-        det_attrs = {attr for attr, var in self.determinant_vars if var.get()}
-        dep_attrs = {attr for attr, var in self.dependent_vars if var.get()}
+        checked_det = [(attr, var) for attr, var in self.determinant_vars if var.get()]
+        checked_dep = [(attr, var) for attr, var in self.dependent_vars if var.get()]
+        det_attrs = {attr for attr, _ in checked_det}
+        dep_attrs = {attr for attr, _ in checked_dep}
 
         if not det_attrs or not dep_attrs:
             messagebox.showwarning("Ошибка", "Выберите атрибуты для детерминанта и зависимой части.")
@@ -577,13 +1028,23 @@ class NormalizationGUI:
             return
 
         mvd = MultivaluedDependency(det_attrs, dep_attrs)
-        self.multivalued_dependencies.append(mvd)
-        self.mvd_listbox.insert(tk.END, str(mvd))
 
-        # Очистка выделения
-        for _, var in self.determinant_vars:
+        mvd_key = self._interned_key(mvd)
+        if mvd_key in self._mvd_keys:
+            messagebox.showwarning("Ошибка", "Такая многозначная зависимость уже существует.")
+            return
+
+        self.multivalued_dependencies.append(mvd)
+        self._inputs_dirty = True
+        self._mvd_keys.add(mvd_key)
+        self._index_dependency(self._attr_to_mvds, mvd)
+        if not self._defer_listbox_updates:
+            self.mvd_listbox.insert(tk.END, str(mvd))
+
+        # Очистка выделения: только отмеченные чекбоксы
+        for _, var in checked_det:
             var.set(False)
-        for _, var in self.dependent_vars:
+        for _, var in checked_dep:
             var.set(False)
 
     def remove_mvd(self):
@@ -592,12 +1053,18 @@ class NormalizationGUI:
         if not selection:
             return
         index = selection[0]
-        self.multivalued_dependencies.pop(index)
+        mvd = self.multivalued_dependencies.pop(index)
+        self._inputs_dirty = True
+        self._mvd_keys.discard(self._dependency_key(mvd))
+        self._unindex_dependency(self._attr_to_mvds, mvd)
         self.mvd_listbox.delete(index)
 
     def clear_mvds(self):
         """Очистка всех МЗД"""
         self.multivalued_dependencies.clear()
+        self._inputs_dirty = True
+        self._mvd_keys.clear()
+        self._attr_to_mvds.clear()
         self.mvd_listbox.delete(0, tk.END)
 
     def perform_analysis(self):
@@ -606,32 +1073,91 @@ class NormalizationGUI:
             messagebox.showwarning("Ошибка", "Добавьте атрибуты отношения")
             return
 
-        # Создание отношения
-        self.current_relation = Relation(
-            name=self.relation_name_var.get(),
-            attributes=self.attributes.copy(),
-            functional_dependencies=self.functional_dependencies.copy(),
-            # ИСПРАВЛЕНИЕ: Добавлена передача многозначных зависимостей
-            multivalued_dependencies=self.multivalued_dependencies.copy()
+        # Создание отношения; без изменений ввода переиспользуется прежнее
+        name = self.relation_name_var.get()
+        if (self._inputs_dirty or self.current_relation is None
+                or self.current_relation.name != name):
+            self.current_relation = Relation(
+                name=name,
+                attributes=self.attributes.copy(),
+                functional_dependencies=self.functional_dependencies.copy(),
+                # ИСПРАВЛЕНИЕ: Добавлена передача многозначных зависимостей
+                multivalued_dependencies=self.multivalued_dependencies.copy()
+            )
+            self._inputs_dirty = False
+
+        relation = self.current_relation
+        # Анализ может быть запущен из нормализации до открытия вкладки анализа
+        self._ensure_tab_built(self.analysis_frame)
+
+        def build_report() -> str:
+            # Анализ: повторный запуск без изменений переиспользует ключи из кэша
+            analyzer = self._get_analyzer(relation)
+
+            # Минимальное покрытие
+            minimal_cover = FDAlgorithms.minimal_cover(relation.functional_dependencies)
+
+            parts: List[str] = [
+                analyzer.get_analysis_report(),
+                # Дополнительная информация
+                "\n", SEP_EQ_50,
+                "Дополнительный анализ:\n\n",
+                f"Минимальное покрытие ({len(minimal_cover)} ФЗ):\n",
+            ]
+            parts.extend(f"  - {fd}\n" for fd in minimal_cover)
+            return "".join(parts)
+
+        self.analysis_button.config(state='disabled')
+        self._run_in_background(build_report, self._display_analysis,
+                                lambda e: self._on_background_error(e, self.analysis_button, "анализе"))
+
+    def _display_analysis(self, report: str):
+        """Отображение результатов анализа (в главном потоке)"""
+        self.analysis_button.config(state='normal')
+        self._set_text(self.analysis_text, "")
+        self._stream_insert(self.analysis_text, report)
+
+    def _stream_insert(self, widget: tk.Text, content: str, chunk: int = 16384, offset: int = 0):
+        """
+        Вставляет текст порциями через after_idle, чтобы большие отчеты не блокировали перерисовку
+        """
+        key = str(widget)
+        pending = self._stream_jobs.pop(key, None)
+        if pending is not None:
+            self.root.after_cancel(pending)
+
+        # Следующая порция передается смещением: остаток строки не копируется
+        end = offset + chunk
+        widget.configure(state='normal')
+        widget.insert(tk.END, content[offset:end])
+        widget.configure(state='disabled')
+        if len(content) > end:
+            self._stream_jobs[key] = self.root.after_idle(self._stream_insert, widget, content, chunk, end)
+
+    def _run_in_background(self, task, on_success, on_error, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Выполняет task в фоновом потоке (по умолчанию в пуле интерактивных задач);
+        on_success/on_error вызываются в главном потоке Tk
+        """
+        future = (executor or self._executor).submit(task)
+        future.add_done_callback(
+            lambda f: self.root.after(0, self._finish_background_task, f, on_success, on_error)
         )
+        return future
 
-        # Анализ
-        analyzer = NormalFormAnalyzer(self.current_relation)
-        report = analyzer.get_analysis_report()
-
-        # Дополнительная информация
-        report += "\n" + "=" * 50 + "\n"
-        report += "Дополнительный анализ:\n\n"
-
-        # Минимальное покрытие
-        minimal_cover = FDAlgorithms.minimal_cover(self.functional_dependencies)
-        report += f"Минимальное покрытие ({len(minimal_cover)} ФЗ):\n"
-        for fd in minimal_cover:
-            report += f"  - {fd}\n"
+    @staticmethod
+    def _finish_background_task(future, on_success, on_error):
+        error = future.exception()
+        if error is None:
+            on_success(future.result())
+        else:
+            on_error(error)
 
-        # Отображение результатов
-        self.analysis_text.delete(1.0, tk.END)
-        self.analysis_text.insert(1.0, report)
+    def _on_background_error(self, error: BaseException, button: ttk.Button, action: str):
+        button.config(state='normal')
+        messagebox.showerror("Ошибка", f"Ошибка при {action}: {str(error)}")
+        import traceback
+        traceback.print_exception(type(error), error, error.__traceback__)
 
     def perform_normalization(self):
         """Выполнение нормализации"""
@@ -644,59 +1170,78 @@ class NormalizationGUI:
 
         target = self.target_nf_var.get()
 
-        try:
-            if target == "2НФ":
-                result = Decomposer.decompose_to_2nf(self.current_relation)
-            elif target == "3НФ":
-                result = Decomposer.decompose_to_3nf(self.current_relation)
-            elif target == "НФБК":
-                result = Decomposer.decompose_to_bcnf(self.current_relation)
-            elif target == "4НФ":
-                result = Decomposer.decompose_to_4nf(self.current_relation)
-            else:
-                messagebox.showerror("Ошибка", "Неизвестная целевая нормальная форма.")
-                return
+        decompose = {
+            "2НФ": Decomposer.decompose_to_2nf,
+            "3НФ": Decomposer.decompose_to_3nf,
+            "НФБК": Decomposer.decompose_to_bcnf,
+            "4НФ": Decomposer.decompose_to_4nf,
+        }.get(target)
+        if decompose is None:
+            messagebox.showerror("Ошибка", "Неизвестная целевая нормальная форма.")
+            return
 
-            self.normalization_result = result
+        relation = self.current_relation
+        self._analyzer_cache.clear()
 
-            output = f"Нормализация в {target}\n"
-            output += "=" * 50 + "\n\n"
-            output += result.get_summary()
+        def normalize() -> Tuple[NormalizationResult, str, list]:
+            result = decompose(relation)
+
+            # Сначала анализируем все результирующие отношения, затем форматируем вывод
+            per_rel_analysis = []
+            for rel in result.decomposed_relations:
+                # Ключи берутся из анализатора: он уже перебрал подмножества атрибутов
+                analyzer = self._get_analyzer(rel)
+                keys = analyzer.candidate_keys
+                keys_text = ", ".join(["{%s}" % ", ".join([a.name for a in k]) for k in keys])
+                per_rel_analysis.append((keys, analyzer.determine_normal_form()[0], keys_text))
+
+            parts: List[str] = [
+                f"Нормализация в {target}\n",
+                SEP_EQ_50, "\n",
+                result.get_summary(),
+            ]
 
             if result.steps:
-                output += "\nШаги декомпозиции:\n"
+                parts.append("\nШаги декомпозиции:\n")
                 for i, step in enumerate(result.steps, 1):
-                    output += f"\n{i}. {step.reason}\n"
-                    output += f"   {step.original_relation} → "
-                    output += ", ".join([str(r) for r in step.resulting_relations]) + "\n"
+                    parts.append(f"\n{i}. {step.reason}\n")
+                    parts.append(f"   {step.original_relation} → ")
+                    parts.append(", ".join(map(str, step.resulting_relations)) + "\n")
                     if step.violated_dependency:
-                         output += f"      Нарушенная ФЗ: {step.violated_dependency}\n"
+                         parts.append(f"      Нарушенная ФЗ: {step.violated_dependency}\n")
 
 
-            output += f"\nСохранение зависимостей:\n"
-            output += f"  - Сохранено: {len(result.preserved_dependencies)}\n"
-            output += f"  - Потеряно: {len(result.lost_dependencies)}\n"
+            parts.append(f"\nСохранение зависимостей:\n")
+            parts.append(f"  - Сохранено: {len(result.preserved_dependencies)}\n")
+            parts.append(f"  - Потеряно: {len(result.lost_dependencies)}\n")
 
             if result.lost_dependencies:
-                output += "\nПотерянные зависимости:\n"
+                parts.append("\nПотерянные зависимости:\n")
                 for fd in result.lost_dependencies:
-                    output += f"  - {fd}\n"
+                    parts.append(f"  - {fd}\n")
 
-            output += "\nАнализ результирующих отношений:\n"
-            for rel in result.decomposed_relations:
-                analyzer = NormalFormAnalyzer(rel)
-                nf, _ = analyzer.determine_normal_form()
-                output += f"  - {rel}: {nf.value}\n"
+            parts.append("\nАнализ результирующих отношений:\n")
+            for rel, (_, nf, _) in zip(result.decomposed_relations, per_rel_analysis):
+                parts.append(f"  - {rel}: {nf.value}\n")
 
-            self.normalization_text.delete(1.0, tk.END)
-            self.normalization_text.insert(1.0, output)
+            return result, "".join(parts), per_rel_analysis
 
-            self.update_results()
+        self.normalization_button.config(state='disabled')
+        self._run_in_background(normalize, self._display_normalization,
+                                lambda e: self._on_background_error(e, self.normalization_button, "нормализации"))
 
-        except Exception as e:
-            messagebox.showerror("Ошибка", f"Ошибка при нормализации: {str(e)}")
-            import traceback
-            traceback.print_exc()
+    def _display_normalization(self, payload: Tuple[NormalizationResult, str, list]):
+        """Отображение результатов нормализации (в главном потоке)"""
+        result, output, per_rel_analysis = payload
+        self.normalization_button.config(state='normal')
+        self.normalization_result = result
+        self._cached_sql = None
+        self._per_rel_analysis = per_rel_analysis
+
+        self._set_text(self.normalization_text, "")
+        self._stream_insert(self.normalization_text, output)
+
+        self.update_results()
 
 
     def update_results(self):
@@ -704,79 +1249,72 @@ class NormalizationGUI:
         if not self.normalization_result:
             return
 
-        output = "ИТОГОВЫЕ РЕЗУЛЬТАТЫ НОРМАЛИЗАЦИИ\n"
-        output += "=" * 60 + "\n\n"
-
-        output += "Исходное отношение:\n"
-        output += f"  {self.normalization_result.original_relation}\n"
-        output += f"  Нормальная форма: {self.normalization_result.original_form.value}\n\n"
-
-        output += f"Результирующие отношения ({len(self.normalization_result.decomposed_relations)}):\n\n"
+        parts: List[str] = [
+            "ИТОГОВЫЕ РЕЗУЛЬТАТЫ НОРМАЛИЗАЦИИ\n",
+            SEP_EQ_60, "\n",
+            "Исходное отношение:\n",
+            f"  {self.normalization_result.original_relation}\n",
+            f"  Нормальная форма: {self.normalization_result.original_form.value}\n\n",
+            f"Результирующие отношения ({len(self.normalization_result.decomposed_relations)}):\n\n",
+        ]
 
-        for i, rel in enumerate(self.normalization_result.decomposed_relations, 1):
-            output += f"{i}. {rel.name}\n"
-            output += f"   Атрибуты: {', '.join([a.name for a in rel.attributes])}\n"
+        relations = zip(self.normalization_result.decomposed_relations, self._per_rel_analysis)
+        for i, (rel, (keys, _, keys_text)) in enumerate(relations, 1):
+            parts.append(f"{i}. {rel.name}\n")
+            parts.append(f"   Атрибуты: {rel.attr_names_csv}\n")
 
-            analyzer = NormalFormAnalyzer(rel)
-            keys = analyzer.candidate_keys # Используем вычисленные кандидатные ключи
+            # Кандидатные ключи вычислены при нормализации
             if keys:
-                output += f"   Ключи: "
-                key_strs = ["{" + ", ".join([a.name for a in k]) + "}" for k in keys]
-                output += ", ".join(key_strs) + "\n"
+                parts.append(f"   Ключи: {keys_text}\n")
 
             # ФЗ для каждого результирующего отношения
             if rel.functional_dependencies:
-                output += f"   Функциональные зависимости ({len(rel.functional_dependencies)}):\n"
+                parts.append(f"   Функциональные зависимости ({len(rel.functional_dependencies)}):\n")
                 for fd_idx, fd_item in enumerate(rel.functional_dependencies):
-                    output += f"     {fd_idx+1}. {fd_item}\n"
+                    parts.append(f"     {fd_idx+1}. {fd_item}\n")
             else:
-                output += f"   Функциональные зависимости: отсутствуют\n"
-            output += "\n"
+                parts.append(f"   Функциональные зависимости: отсутствуют\n")
+            parts.append("\n")
 
 
-        output += "\nSQL DDL:\n"
-        output += "-" * 40 + "\n"
-        output += self.generate_sql()
+        parts.append("\nSQL DDL:\n")
+        parts.append(SEP_DASH_40)
+        parts.append(self.generate_sql())
+        output = "".join(parts)
 
-        self.results_text.delete(1.0, tk.END)
-        self.results_text.insert(1.0, output)
+        self._ensure_tab_built(self.results_frame)
+        self._set_text(self.results_text, output)
 
     def generate_sql(self):
         """Генерация SQL DDL для результирующих отношений"""
-        if not self.normalization_result:
-            return ""
-
-        sql = ""
-        for rel in self.normalization_result.decomposed_relations:
-            sql += f"CREATE TABLE {rel.name} (\n"
-
-            # Собираем атрибуты первичного ключа из анализатора, если is_primary_key не установлен
-            # или если хотим использовать кандидатные ключи для PK
-            analyzer = NormalFormAnalyzer(rel) # Анализируем каждое декомпозированное отношение
-            # Предположим, первый кандидатный ключ становится первичным, если не задан is_primary_key
-            pk_attributes_for_table: Set[Attribute] = set()
-            if analyzer.candidate_keys:
-                pk_attributes_for_table = analyzer.candidate_keys[0]
+        if self._cached_sql is None:
+            self._cached_sql = "".join(self._iter_sql())
+        return self._cached_sql
 
+    def _iter_sql(self):
+        """DDL результирующих отношений по одной таблице"""
+        if not self.normalization_result:
+            return
 
-            attr_definitions = []
-            for attr in rel.attributes:
-                attr_def = f"    {attr.name} {attr.data_type}"
-                # Если атрибут является частью вычисленного PK для этой таблицы
-                if attr in pk_attributes_for_table:
-                    attr_def += " NOT NULL"
-                attr_definitions.append(attr_def)
+        for rel, (candidate_keys, _, _) in zip(self.normalization_result.decomposed_relations,
+                                            self._per_rel_analysis):
+            pk_attributes_for_table = self._get_pk(rel, candidate_keys)
+            # Ключи собираются из множеств ФЗ, поэтому объекты атрибутов в них могут
+            # отличаться от rel.attributes; сравниваем по строкам имен
+            pk_name_set = frozenset(a.name for a in pk_attributes_for_table)
 
-            sql += ",\n".join(attr_definitions)
+            # Атрибуты PK для этой таблицы объявляются NOT NULL
+            body = ",\n".join([
+                f"    {attr.name} {attr.data_type}{' NOT NULL' if attr.name in pk_name_set else ''}"
+                for attr in rel.attributes
+            ])
 
             if pk_attributes_for_table:
                 pk_names = ", ".join([a.name for a in pk_attributes_for_table])
-                sql += f",\n    PRIMARY KEY ({pk_names})\n"
+                yield f"CREATE TABLE {rel.name} (\n{body},\n    PRIMARY KEY ({pk_names})\n);\n\n"
             else:
-                sql += "\n" # Если нет ПК, просто завершаем список атрибутов
-
-            sql += ");\n\n"
-        return sql
+                # Если нет ПК, просто завершаем список атрибутов
+                yield f"CREATE TABLE {rel.name} (\n{body}\n);\n\n"
 
     def export_to_sql(self):
         """Экспорт в SQL файл"""
@@ -784,16 +1322,27 @@ class NormalizationGUI:
             messagebox.showwarning("Ошибка", "Нет результатов для экспорта")
             return
 
-        from tkinter import filedialog
         filename = filedialog.asksaveasfilename(
             defaultextension=".sql",
             filetypes=[("SQL files", "*.sql"), ("All files", "*.*")]
         )
 
         if filename:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.generate_sql())
-            messagebox.showinfo("Успешно", f"SQL экспортирован в {filename}")\
+            # Запись во временный файл и атомарная замена: при ошибке прежний файл не портится
+            tmp_filename = filename + '.tmp'
+            try:
+                with open(tmp_filename, 'w', encoding='utf-8', buffering=1 << 20) as f:
+                    if self._cached_sql is not None:
+                        f.write(self._cached_sql)
+                    else:
+                        f.writelines(self._iter_sql())
+                os.replace(tmp_filename, filename)
+            except OSError as e:
+                if os.path.exists(tmp_filename):
+                    os.remove(tmp_filename)
+                messagebox.showerror("Ошибка", f"Не удалось сохранить SQL:\n{e}")
+                return
+            messagebox.showinfo("Успешно", f"SQL экспортирован в {filename}")
 
 
     def run_decomposition_test(self):
@@ -814,17 +1363,7 @@ class NormalizationGUI:
         orig_rel = self.normalization_result.original_relation
         normalized = self.normalization_result.decomposed_relations
 
-        # Перехватим весь stdout, который печатает test_decomposition
-        buf = io.StringIO()
-        try:
-            with redirect_stdout(buf):
-                test_decomposition(orig_rel, normalized, num_rows)
-        except Exception as e:
-            buf.write("\n[ERROR] При выполнении test_decomposition произошла ошибка:\n")
-            buf.write(str(e))
-        log = buf.getvalue()
-
-        # Показать результат во всплывающем окне с прокруткой
+        # Окно создается сразу, лог дописывается в него по мере выполнения теста
         popup = tk.Toplevel(self.root)
         popup.title("Результат теста декомпозиции")
         popup.geometry("700x500")
@@ -834,11 +1373,28 @@ class NormalizationGUI:
 
         txt = scrolledtext.ScrolledText(popup, wrap=tk.NONE)
         txt.pack(fill='both', expand=True, padx=5, pady=5)
-        txt.insert("1.0", log)
         txt.configure(state="disabled")
 
         ttk.Button(popup, text="Закрыть", command=popup.destroy).pack(pady=(0,5))
 
+        sink = _TkSink(self.root, txt)
+
+        def run_test():
+            # Лог теста пишется прямо в окно; общий sys.stdout не подменяется
+            try:
+                from data_test import test_decomposition
+                test_decomposition(orig_rel, normalized, num_rows, out=sink)
+            except Exception as e:
+                sink.write("\n[ERROR] При выполнении test_decomposition произошла ошибка:\n")
+                sink.write(str(e))
+            finally:
+                sink.flush()
+
+        self._run_in_background(run_test,
+                                lambda _: None,
+                                lambda e: messagebox.showerror("Ошибка", f"Ошибка теста декомпозиции:\n{e}"),
+                                executor=self._db_executor)
+
     def run_performance_gui(self):
         """Запустить измерение производительности SELECT-запросов."""
         if not self.normalization_result:
@@ -869,48 +1425,36 @@ class NormalizationGUI:
         progress_bar.pack(pady=10)
         progress_bar.start(10)
 
-        # Запускаем тест в отдельном потоке
-        import threading
-        results = {}
-        error = None
-
-        def run_test():
-            nonlocal results, error
-            try:
-                # Вызываем обновленный run_performance_test
-                results = run_performance_test(orig_rel, num_rows=num_rows, repeats=10)
-            except Exception as e:
-                error = str(e)
-                import traceback
-                traceback.print_exc()
+        def on_error(error: BaseException):
+            import traceback
+            traceback.print_exception(type(error), error, error.__traceback__)
+            progress_bar.stop()
+            progress_window.destroy()
+            messagebox.showerror("Ошибка", f"Ошибка при выполнении теста производительности:\n{error}")
 
-        # Запускаем тест
-        test_thread = threading.Thread(target=run_test)
-        test_thread.start()
+        def on_success(results: Dict[str, Dict[str, float]]):
+            progress_bar.stop()
+            progress_window.destroy()
 
-        # Ждем завершения
-        def check_completion():
-            if test_thread.is_alive():
-                progress_window.after(100, check_completion)
+            if results:
+                # Показываем результаты в отдельном окне
+                self.show_performance_results(results)
+                # Строим гистограммы вместо графиков
+                try:
+                    from performance_test import plot_performance_histogram
+                    plot_performance_histogram(results)
+                except Exception as e:
+                    print(f"Ошибка при построении графиков: {e}")
             else:
-                progress_bar.stop()
-                progress_window.destroy()
-
-                if error:
-                    messagebox.showerror("Ошибка", f"Ошибка при выполнении теста производительности:\n{error}")
-                elif results:
-                    # Показываем результаты в отдельном окне
-                    self.show_performance_results(results)
-                    # Строим гистограммы вместо графиков
-                    try:
-                        from performance_test import plot_performance_histogram
-                        plot_performance_histogram(results)
-                    except Exception as e:
-                        print(f"Ошибка при построении графиков: {e}")
-                else:
-                    messagebox.showwarning("Ошибка", "Не удалось получить результаты теста")
+                messagebox.showwarning("Ошибка", "Не удалось получить результаты теста")
+
+        def run_test() -> Dict[str, Dict[str, float]]:
+            # Импорт numpy/matplotlib тоже выполняется в фоне
+            from performance_test import run_performance_test
+            return run_performance_test(orig_rel, num_rows=num_rows, repeats=10)
 
-        progress_window.after(100, check_completion)
+        # Тест выполняется в пуле тестов с БД, результат приходит в главный поток через after
+        self._run_in_background(run_test, on_success, on_error, executor=self._db_executor)
 
     def show_performance_results(self, results: Dict[str, Dict[str, float]]):
         """Показать результаты теста производительности в отдельном окне"""
@@ -922,91 +1466,80 @@ class NormalizationGUI:
         text_frame = ttk.Frame(result_window)
         text_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
-        text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD, font=("Courier", 9))
+        text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD, font=("Courier", 9),
+                                                **_REPORT_TEXT_OPTIONS)
         text_widget.pack(fill='both', expand=True)
 
         # Формируем отчет
-        report = "РЕЗУЛЬТАТЫ ТЕСТА ПРОИЗВОДИТЕЛЬНОСТИ ЗАПРОСОВ\n"
-        report += "=" * 80 + "\n\n"
-
-        # Описания типов запросов
-        query_descriptions = {
-            'full_scan': 'Полное сканирование таблицы',
-            'pk_lookup': 'Поиск записи по первичному ключу',
-            'aggregation': 'Агрегация данных (COUNT)',
-            'group_by': 'Группировка данных',
-            'filter_non_indexed': 'Фильтрация по неиндексированному полю',
-            'full_join': 'Полное соединение всех таблиц',
-            'join_with_filter': 'JOIN с условием фильтрации',
-            'single_table': 'Запрос к одной таблице',
-            'join_aggregation': 'Агрегация после JOIN',
-            'subquery': 'Запрос с подзапросом'
-        }
+        buf = io.StringIO()
+        w = buf.write
+        w("РЕЗУЛЬТАТЫ ТЕСТА ПРОИЗВОДИТЕЛЬНОСТИ ЗАПРОСОВ\n")
+        w(SEP_EQ_80)
+        w("\n")
+
+        query_descriptions = QUERY_DESCRIPTIONS
 
         # Сводная таблица
-        report += "Сводная таблица времени выполнения (мс):\n"
-        report += "-" * 80 + "\n"
+        w("Сводная таблица времени выполнения (мс):\n")
+        w(SEP_DASH_80)
 
         # Собираем все типы запросов
-        all_query_types = set()
-        for level_queries in results.values():
-            all_query_types.update(level_queries.keys())
-        all_query_types = sorted(list(all_query_types))
+        all_query_types = sorted({qt for level_queries in results.values() for qt in level_queries})
 
         # Заголовок таблицы
-        header = f"{'Тип запроса':<30}"
-        for level in results.keys():
-            header += f" | {level:>12}"
-        report += header + "\n"
-        report += "-" * 80 + "\n"
+        header = f"{'Тип запроса':<30}" + "".join(f" | {level:>12}" for level in results.keys())
+        w(header + "\n")
+        w(SEP_DASH_80)
 
         # Данные таблицы
         for qt in all_query_types:
             desc = query_descriptions.get(qt, qt)
-            row = f"{desc:<30}"
+            cells = [f"{desc:<30}"]
 
             for level in results.keys():
                 if qt in results[level]:
                     time_ms = results[level][qt] * 1000
-                    row += f" | {time_ms:>10.2f} "
+                    cells.append(f" | {time_ms:>10.2f} ")
                 else:
-                    row += f" | {'—':>12}"
+                    cells.append(f" | {'—':>12}")
 
-            report += row + "\n"
+            w("".join(cells) + "\n")
 
-        report += "-" * 80 + "\n\n"
+        w(SEP_DASH_80)
+
+        w("\n")
 
         # Анализ результатов
-        report += "АНАЛИЗ РЕЗУЛЬТАТОВ:\n"
-        report += "=" * 80 + "\n\n"
+        w("АНАЛИЗ РЕЗУЛЬТАТОВ:\n")
+        w(SEP_EQ_80)
+        w("\n")
 
         # Находим самые быстрые и медленные запросы для каждого уровня
         for level in results.keys():
-            report += f"{level}:\n"
+            w(f"{level}:\n")
 
             if results[level]:
-                # Сортируем по времени
-                sorted_queries = sorted(results[level].items(), key=lambda x: x[1])
+                items = results[level].items()
 
                 # Самый быстрый
-                fastest_query, fastest_time = sorted_queries[0]
-                report += f"  ✓ Самый быстрый: {query_descriptions.get(fastest_query, fastest_query)} "
-                report += f"({fastest_time * 1000:.2f} мс)\n"
+                fastest_query, fastest_time = min(items, key=lambda x: x[1])
+                w(f"  ✓ Самый быстрый: {query_descriptions.get(fastest_query, fastest_query)} "
+                  f"({fastest_time * 1000:.2f} мс)\n")
 
                 # Самый медленный
-                slowest_query, slowest_time = sorted_queries[-1]
-                report += f"  ✗ Самый медленный: {query_descriptions.get(slowest_query, slowest_query)} "
-                report += f"({slowest_time * 1000:.2f} мс)\n"
+                slowest_query, slowest_time = max(items, key=lambda x: x[1])
+                w(f"  ✗ Самый медленный: {query_descriptions.get(slowest_query, slowest_query)} "
+                  f"({slowest_time * 1000:.2f} мс)\n")
 
                 # Среднее время
-                avg_time = sum(results[level].values()) / len(results[level])
-                report += f"  • Среднее время: {avg_time * 1000:.2f} мс\n"
+                avg_time = fmean(results[level].values())
+                w(f"  • Среднее время: {avg_time * 1000:.2f} мс\n")
 
-            report += "\n"
+            w("\n")
 
         # Выводы
-        report += "ВЫВОДЫ:\n"
-        report += "=" * 80 + "\n"
+        w("ВЫВОДЫ:\n")
+        w(SEP_EQ_80)
 
         # Сравнение JOIN запросов
         join_times = {}
@@ -1018,33 +1551,31 @@ class NormalizationGUI:
                     join_times[level].append(time)
 
         if join_times:
-            report += "\n1. Производительность JOIN-запросов:\n"
+            w("\n1. Производительность JOIN-запросов:\n")
             for level, times in join_times.items():
                 avg_join_time = sum(times) / len(times) if times else 0
-                report += f"   - {level}: среднее время JOIN = {avg_join_time * 1000:.2f} мс\n"
+                w(f"   - {level}: среднее время JOIN = {avg_join_time * 1000:.2f} мс\n")
 
         # Влияние нормализации на простые запросы
-        simple_query_impact = {}
-        for qt in ['full_scan', 'pk_lookup', 'single_table']:
-            times_by_level = {}
-            for level, queries in results.items():
+        tracked = ('full_scan', 'pk_lookup', 'single_table')
+        simple_query_impact: Dict[str, Dict[str, float]] = {qt: {} for qt in tracked}
+        for level, queries in results.items():
+            for qt in tracked:
                 if qt in queries:
-                    times_by_level[level] = queries[qt]
-
-            if len(times_by_level) > 1:
-                simple_query_impact[qt] = times_by_level
+                    simple_query_impact[qt][level] = queries[qt]
+        simple_query_impact = {qt: times for qt, times in simple_query_impact.items() if len(times) > 1}
 
         if simple_query_impact:
-            report += "\n2. Влияние нормализации на простые запросы:\n"
+            w("\n2. Влияние нормализации на простые запросы:\n")
             for qt, times in simple_query_impact.items():
-                report += f"   - {query_descriptions.get(qt, qt)}:\n"
-                base_time = list(times.values())[0]
+                w(f"   - {query_descriptions.get(qt, qt)}:\n")
+                base_time = next(iter(times.values()))
                 for level, time in times.items():
                     change = ((time - base_time) / base_time * 100) if base_time > 0 else 0
-                    report += f"     • {level}: {time * 1000:.2f} мс"
-                    if change != 0:
-                        report += f" ({change:+.1f}%)"
-                    report += "\n"
+                    change_str = f" ({change:+.1f}%)" if change != 0 else ""
+                    w(f"     • {level}: {time * 1000:.2f} мс{change_str}\n")
+
+        report = buf.getvalue()
 
         # Вставляем отчет в текстовое поле
         text_widget.insert('1.0', report)
@@ -1055,8 +1586,9 @@ class NormalizationGUI:
         button_frame.pack(fill='x', padx=5, pady=5)
 
         def copy_all():
-            text_widget.tag_add("sel", "1.0", "end")
-            text_widget.event_generate("<<Copy>>")
+            # Отчет уже собран в строку: копируем ее без выделения всего текста в виджете
+            self.root.clipboard_clear()
+            self.root.clipboard_append(report)
             copy_label = ttk.Label(button_frame, text="Скопировано!", foreground="green")
             copy_label.pack(side='left', padx=10)
             result_window.after(2000, copy_label.destroy)
@@ -1125,38 +1657,81 @@ class NormalizationGUI:
         log_text.pack(fill='both', expand=True, padx=5, pady=5)
 
         # Запускаем внешний скрипт в отдельном потоке
-        import threading
         import subprocess
         import sys
-        import os
+
+        status_label.config(text="Запуск simple_memory_test.py...")
+        log_text.insert(tk.END, f"[GUI] Запуск: python simple_memory_test.py\n")
+        log_text.see(tk.END)
+
+        done = threading.Event()
+
+        # Вывод скрипта копится здесь; в главный поток уходит не больше одного
+        # отложенного обновления за раз, сколько бы строк ни напечатал скрипт
+        pending_lines: List[str] = []
+        pending_lock = threading.Lock()
+        flush_scheduled = False
+
+        def flush_output():
+            nonlocal flush_scheduled
+            with pending_lock:
+                lines = pending_lines[:]
+                pending_lines.clear()
+                flush_scheduled = False
+            if not lines or not progress_window.winfo_exists():
+                return
+            log_text.insert(tk.END, "".join(lines))
+            log_text.see(tk.END)
+            last_line = next((l for l in reversed(lines) if l.strip()), '')
+            if last_line:
+                status_label.config(text=last_line.strip()[:50] + '...')
+
+        def queue_output(line: str):
+            nonlocal flush_scheduled
+            with pending_lock:
+                pending_lines.append(line)
+                if flush_scheduled:
+                    return
+                flush_scheduled = True
+            self.root.after(250, flush_output)
+
+        def finish(return_code: Optional[int], error: Optional[Exception]):
+            # Вызывается один раз в главном потоке, когда рабочий поток завершился
+            flush_output()
+            if not progress_window.winfo_exists():
+                return
+            progress_bar.stop()
+            if error is not None:
+                error_msg = f"Ошибка запуска скрипта: {error}"
+                status_label.config(text=error_msg)
+                log_text.insert(tk.END, f"\n❌ {error_msg}\n")
+            elif return_code == 0:
+                status_label.config(text="Тест завершен успешно!")
+                log_text.insert(tk.END, "\n✅ ТЕСТ ПАМЯТИ ЗАВЕРШЕН УСПЕШНО!\n")
+                log_text.insert(tk.END, "Результаты и графики отображены в отдельных окнах.\n")
+            else:
+                status_label.config(text=f"Ошибка выполнения (код: {return_code})")
+                log_text.insert(tk.END, f"\n❌ ОШИБКА ВЫПОЛНЕНИЯ (код: {return_code})\n")
+            log_text.see(tk.END)
 
         def run_external_script():
+            return_code, error = None, None
             try:
-                status_label.config(text="Запуск simple_memory_test.py...")
-                log_text.insert(tk.END, f"[GUI] Запуск: python simple_memory_test.py\n")
-                log_text.see(tk.END)
-                
-                # Просто запускаем скрипт без перехвата вывода
                 script_path = os.path.join(os.getcwd(), "simple_memory_test.py")
-                return_code = subprocess.call([sys.executable, script_path], cwd=os.getcwd())
-                
-                if return_code == 0:
-                    status_label.config(text="Тест завершен успешно!")
-                    log_text.insert(tk.END, "\n✅ ТЕСТ ПАМЯТИ ЗАВЕРШЕН УСПЕШНО!\n")
-                    log_text.insert(tk.END, "Результаты и графики отображены в отдельных окнах.\n")
-                else:
-                    status_label.config(text=f"Ошибка выполнения (код: {return_code})")
-                    log_text.insert(tk.END, f"\n❌ ОШИБКА ВЫПОЛНЕНИЯ (код: {return_code})\n")
-                
-                log_text.see(tk.END)
-                
+                env = dict(os.environ, PYTHONIOENCODING="utf-8", PYTHONUNBUFFERED="1")
+                proc = subprocess.Popen([sys.executable, script_path], cwd=os.getcwd(), env=env,
+                                        stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                        text=True, encoding="utf-8", errors="replace")
+                for line in proc.stdout:
+                    sys.stdout.write(line)  # вывод по-прежнему дублируется в консоль
+                    queue_output(line)
+                return_code = proc.wait()
             except Exception as e:
-                error_msg = f"Ошибка запуска скрипта: {e}"
-                status_label.config(text=error_msg)
-                log_text.insert(tk.END, f"\n❌ {error_msg}\n")
-                log_text.see(tk.END)
+                error = e
             finally:
-                progress_bar.stop()
+                done.set()
+                # Виджеты обновляются только из главного потока, без периодического опроса
+                self.root.after(0, finish, return_code, error)
 
         # Запускаем в отдельном потоке
         test_thread = threading.Thread(target=run_external_script, daemon=True)
@@ -1167,6 +1742,8 @@ class NormalizationGUI:
         button_frame.pack(pady=10)
         
         def close_window():
+            if not done.is_set():
+                print("[GUI] Окно закрыто, внешний скрипт продолжает работу")
             progress_bar.stop()
             progress_window.destroy()
         
@@ -1184,85 +1761,93 @@ class NormalizationGUI:
         text_frame = ttk.Frame(result_window)
         text_frame.pack(fill='both', expand=True, padx=5, pady=5)
 
-        text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD, font=("Courier", 9))
+        text_widget = scrolledtext.ScrolledText(text_frame, wrap=tk.WORD, font=("Courier", 9),
+                                                **_REPORT_TEXT_OPTIONS)
         text_widget.pack(fill='both', expand=True)
         text_widget.bind("<Control-c>", lambda e: None)
         text_widget.bind("<Control-a>", lambda e: text_widget.tag_add("sel", "1.0", "end"))
 
         # Формируем отчет
-        report = "РЕЗУЛЬТАТЫ ТЕСТА ИСПОЛЬЗОВАНИЯ ПАМЯТИ\n"
-        report += "=" * 70 + "\n\n"
-
+        buf = io.StringIO()
+        w = buf.write
+        w("РЕЗУЛЬТАТЫ ТЕСТА ИСПОЛЬЗОВАНИЯ ПАМЯТИ\n")
+        w(SEP_EQ_70)
+        w("\n")
         # Сводная таблица
-        report += "Сводная таблица размеров (в КБ):\n"
-        report += "-" * 70 + "\n"
-        report += f"{'Уровень':<10} | {'Общий размер':>15} | {'Данные':>12} | {'Индексы':>12} | {'Изменение':>10}\n"
-        report += "-" * 70 + "\n"
+        w("Сводная таблица размеров (в КБ):\n")
+        w(SEP_DASH_70)
+        w(f"{'Уровень':<10} | {'Общий размер':>15} | {'Данные':>12} | {'Индексы':>12} | {'Изменение':>10}\n")
+        w(SEP_DASH_70)
 
         original_size = results.get("Original", {}).get("total_size", 1)
+        summary_levels = {"Original", "2NF", "3NF", "BCNF", "4NF"}
 
-        for level in ["Original", "2NF", "3NF", "BCNF", "4NF"]:
-            if level in results:
-                level_data = results[level]
-                total_size_kb = level_data["total_size"] / 1024
-                table_size_kb = level_data["table_size"] / 1024
-                indexes_size_kb = level_data["indexes_size"] / 1024
+        # Один проход по результатам: размеры в КБ считаются один раз и идут
+        # и в сводную таблицу, и в детальную информацию; попутно ищем min/max
+        detail_parts: List[str] = []
+        min_size = float('inf')
+        min_level = ""
+        max_size = 0
+        max_level = ""
+
+        for level, data in results.items():
+            size = data["total_size"]
+            total_size_kb = size / 1024
+            table_size_kb = data["table_size"] / 1024
+            indexes_size_kb = data["indexes_size"] / 1024
+
+            if level in summary_levels:
+                if size < min_size:
+                    min_size = size
+                    min_level = level
+                if size > max_size:
+                    max_size = size
+                    max_level = level
 
                 if level == "Original":
                     change_str = "базовый"
                 else:
-                    change_pct = ((level_data[
-                                       "total_size"] - original_size) / original_size) * 100 if original_size > 0 else 0
+                    change_pct = ((size - original_size) / original_size) * 100 if original_size > 0 else 0
                     change_str = f"{change_pct:+.1f}%"
 
-                report += f"{level:<10} | {total_size_kb:>15.2f} | {table_size_kb:>12.2f} | {indexes_size_kb:>12.2f} | {change_str:>10}\n"
+                w(f"{level:<10} | {total_size_kb:>15.2f} | {table_size_kb:>12.2f} | {indexes_size_kb:>12.2f} | {change_str:>10}\n")
 
-        report += "-" * 70 + "\n\n"
-
-        # Детальная информация
-        report += "Детальная информация по уровням нормализации:\n"
-        report += "=" * 70 + "\n\n"
+            detail_parts.append(
+                f"{level}:\n"
+                f"  - Общий размер: {total_size_kb:.2f} КБ\n"
+                f"    - Данные: {table_size_kb:.2f} КБ\n"
+                f"    - Индексы: {indexes_size_kb:.2f} КБ\n"
+                f"  - Общее количество строк: {data['row_count']}\n"
+                f"  - Количество таблиц: {data['table_count']}\n\n"
+            )
 
-        for level, data in results.items():
-            report += f"{level}:\n"
-            report += f"  - Общий размер: {data['total_size'] / 1024:.2f} КБ\n"
-            report += f"    - Данные: {data['table_size'] / 1024:.2f} КБ\n"
-            report += f"    - Индексы: {data['indexes_size'] / 1024:.2f} КБ\n"
-            report += f"  - Общее количество строк: {data['row_count']}\n"
-            report += f"  - Количество таблиц: {data['table_count']}\n\n"
+        w(SEP_DASH_70)
 
-        # Выводы
-        report += "ВЫВОДЫ:\n"
-        report += "=" * 70 + "\n"
+        w("\n")
 
-        # Находим самый экономный и самый затратный уровень
-        min_size = float('inf')
-        min_level = ""
-        max_size = 0
-        max_level = ""
-
-        # Сортируем результаты для корректного сравнения
-        sorted_levels = [lvl for lvl in ["Original", "2NF", "3NF", "BCNF", "4NF"] if lvl in results]
+        # Детальная информация
+        w("Детальная информация по уровням нормализации:\n")
+        w(SEP_EQ_70)
+        w("\n")
+        w("".join(detail_parts))
 
-        for level in sorted_levels:
-            size = results[level]["total_size"]
-            if size < min_size:
-                min_size = size
-                min_level = level
-            if size > max_size:
-                max_size = size
-                max_level = level
+        # Выводы
+        w("ВЫВОДЫ:\n")
+        w(SEP_EQ_70)
 
         if min_level and max_level and max_size > 0:
             saving_pct = ((max_size - min_size) / max_size) * 100
-            report += f"- Наиболее экономный уровень: {min_level} ({min_size / 1024:.2f} КБ)\n"
-            report += f"- Наиболее затратный уровень: {max_level} ({max_size / 1024:.2f} КБ)\n"
-            report += f"- Потенциальная экономия дискового пространства: {saving_pct:.1f}%\n"
-
-        report += "- Нормализация увеличивает количество таблиц и сложность JOIN-запросов, но может\n"
-        report += "  существенно сократить занимаемое место за счет устранения избыточности данных.\n"
-        report += "- Оптимальный уровень нормализации зависит от баланса между скоростью запросов\n"
-        report += "  (меньше JOIN'ов) и экономией места на диске."
+            w(f"- Наиболее экономный уровень: {min_level} ({min_size / 1024:.2f} КБ)\n")
+            w(f"- Наиболее затратный уровень: {max_level} ({max_size / 1024:.2f} КБ)\n")
+            w(f"- Потенциальная экономия дискового пространства: {saving_pct:.1f}%\n")
+
+        w(
+            "- Нормализация увеличивает количество таблиц и сложность JOIN-запросов, но может\n"
+            "  существенно сократить занимаемое место за счет устранения избыточности данных.\n"
+            "- Оптимальный уровень нормализации зависит от баланса между скоростью запросов\n"
+            "  (меньше JOIN'ов) и экономией места на диске."
+        )
+        report = buf.getvalue()
 
         # Вставляем отчет в текстовое поле
         text_widget.insert('1.0', report)
@@ -1278,40 +1863,42 @@ class NormalizationGUI:
             messagebox.showwarning("Ошибка", "Нет результатов нормализации для сохранения отчета")
             return
 
-        report_content = self.results_text.get(1.0, tk.END)
-        if not report_content.strip():
-             report_content = self.normalization_text.get(1.0, tk.END) # Fallback to normalization steps
-        if not report_content.strip():
-            report_content = self.analysis_text.get(1.0, tk.END) # Fallback to analysis
+        # Результаты нормализации строятся вместе с вкладкой результатов
+        self._ensure_tab_built(self.results_frame)
+        # Результаты, затем шаги нормализации, затем анализ
+        report_content = self._first_nonblank('results_text', 'normalization_text', 'analysis_text')
 
-        if not report_content.strip():
+        if not report_content:
             messagebox.showwarning("Ошибка", "Нет данных для сохранения отчета")
             return
 
 
-        from tkinter import filedialog
         filename = filedialog.asksaveasfilename(
             defaultextension=".txt",
             filetypes=[("Text files", "*.txt"), ("All files", "*.*")]
         )
 
         if filename:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(report_content)
-            messagebox.showinfo("Успешно", f"Отчет сохранен в {filename}")
+            self._write_report_async(filename, report_content)
+
+    def _write_report_async(self, path: str, content: str):
+        """Записать отчет в фоновом потоке, не блокируя главный цикл Tk"""
+        def write():
+            # Буфер по умолчанию: кодирование идет порциями, без копии всего отчета
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+
+        self._run_in_background(
+            write,
+            lambda _: messagebox.showinfo("Успешно", f"Отчет сохранен в {path}"),
+            lambda error: messagebox.showerror("Ошибка", f"Не удалось сохранить отчет: {error}")
+        )
 
     def new_project(self):
         """Создание нового проекта"""
         if messagebox.askyesno("Новый проект", "Очистить все данные?"):
-            self.clear_attributes()
-            self.clear_fds()
-            self.clear_mvds()  # очистка МЗД
-            self.relation_name_var.set("Отношение1")
-            self.analysis_text.delete(1.0, tk.END)
-            self.normalization_text.delete(1.0, tk.END)
-            self.results_text.delete(1.0, tk.END)
-            self.current_relation = None
-            self.normalization_result = None
+            with self._frozen_ui():
+                self._reset_state(recreate_texts=True)
             # Сброс полей подключений
             self.db_host_var.set("")
             self.db_port_var.set("")
@@ -1321,61 +1908,79 @@ class NormalizationGUI:
 
 
 
-    # MODIFIED: load_example
-    def load_example(self):
-        """Загрузка примера"""
-        # Очистка без диалогового окна
+    def _reset_state(self, recreate_texts: bool = False):
+        """
+        Сбросить атрибуты, зависимости и результаты: сначала Python-состояние,
+        затем виджеты одним проходом
+        """
         self.attributes.clear()
-        self.attr_listbox.delete(0, tk.END)
-        self._update_fd_attribute_checkboxes() # Очистит чекбоксы
-        self.clear_fds()
-        self.relation_name_var.set("Отношение1") # будет переопределено
-        self.analysis_text.delete(1.0, tk.END)
-        self.normalization_text.delete(1.0, tk.END)
-        self.results_text.delete(1.0, tk.END)
+        self._attr_names.clear()
+        self.functional_dependencies.clear()
+        self._attr_to_fds.clear()
+        self._fd_keys.clear()
+        self.multivalued_dependencies.clear()
+        self._attr_to_mvds.clear()
+        self._mvd_keys.clear()
+        self._frozenset_intern.clear()
+        self._inputs_dirty = True
+
+        self._analyzer_cache.clear()
         self.current_relation = None
         self.normalization_result = None
+        self._cached_sql = None
+        self._per_rel_analysis = []
+
+        # Порционные вставки в очищаемые поля больше не нужны
+        for job in self._stream_jobs.values():
+            self.root.after_cancel(job)
+        self._stream_jobs.clear()
+
+        self.attr_listbox.delete(0, tk.END)
+        self.fd_listbox.delete(0, tk.END)
+        self.mvd_listbox.delete(0, tk.END)
+        if recreate_texts:
+            self._recreate_report_texts()
+        else:
+            self._clear_all_text()
+        self._update_fd_attribute_checkboxes()
+
         self.attr_name_var.set("")
         self.is_pk_var.set(False)
+        self.relation_name_var.set("Отношение1")
 
-        self.relation_name_var.set("СотрудникиПроекты")
-
-        example_attrs_data = [
-            ("КодСотрудника", "INTEGER", True),
-            ("ИмяСотрудника", "VARCHAR", False),
-            ("Отдел", "VARCHAR", False),
-            ("НачальникОтдела", "VARCHAR", False),
-            ("КодПроекта", "INTEGER", True), # В классическом примере Сотр(КодСотр, ...) Проект(КодПроекта,...) Связь(КодСотр, КодПроекта, Часы)
-                                          # здесь это одно отношение, так что PK могут быть оба
-            ("НазваниеПроекта", "VARCHAR", False),
-            ("Бюджет", "DECIMAL", False)
-        ]
+    # MODIFIED: load_example
+    def load_example(self):
+        """Загрузка примера"""
+        # Списки атрибутов и ФЗ заполняются одним insert на выходе из блока,
+        # чекбоксы остаются скрытыми до конца загрузки
+        with self._frozen_ui(), self._bulk_listbox_updates():
+            # Очистка без диалогового окна и новые атрибуты: чекбоксы ФЗ перестраиваются
+            # один раз, а повторная загрузка примера переиспользует те же виджеты
+            with self._bulk_attribute_edit():
+                self._reset_state()
+                self._bulk_add_attributes(zip(_EXAMPLE_ATTR_NAMES, _EXAMPLE_ATTR_TYPES, _EXAMPLE_ATTR_PKS))
+            self._load_example_data()
 
-        for name, dtype, is_pk in example_attrs_data:
-            self.attr_name_var.set(name)
-            self.attr_type_var.set(dtype)
-            self.is_pk_var.set(is_pk)
-            self.add_attribute() # Это обновит чекбоксы ФЗ
+        self.relation_name_var.set("СотрудникиПроекты")
 
-        # Helper для установки чекбоксов по имени атрибута
-        def set_fd_checkboxes_by_name(det_names: List[str], dep_names: List[str]):
-            for attr, var in self.determinant_vars:
-                var.set(attr.name in det_names)
-            for attr, var in self.dependent_vars:
-                var.set(attr.name in dep_names)
+        messagebox.showinfo("Пример загружен", _EXAMPLE_INFO)
 
-        # ФЗ
-        # КодСотрудника → ИмяСотрудника, Отдел
-        set_fd_checkboxes_by_name(["КодСотрудника"], ["ИмяСотрудника", "Отдел"])
-        self.add_functional_dependency()
+    def _bulk_add_attributes(self, attrs_data):
+        """Добавить атрибуты (имя, тип, PK) пачкой с одной перестройкой чекбоксов ФЗ"""
+        with self._bulk_listbox_updates():
+            for name, dtype, is_pk in attrs_data:
+                # Повторяющиеся имена при пакетной загрузке пропускаются без предупреждения
+                if name not in self._attr_names:
+                    self.add_attribute(name, dtype, is_pk, _defer_fd_refresh=True)
 
-        # Отдел → НачальникОтдела
-        set_fd_checkboxes_by_name(["Отдел"], ["НачальникОтдела"])
-        self.add_functional_dependency()
+        self._update_fd_attribute_checkboxes()
 
-        # КодПроекта → НазваниеПроекта, Бюджет
-        set_fd_checkboxes_by_name(["КодПроекта"], ["НазваниеПроекта", "Бюджет"])
-        self.add_functional_dependency()
+    def _load_example_data(self):
+        """Добавление ФЗ примера напрямую из атрибутов, без чекбоксов (без обновления списков)"""
+        attrs_by_name = {attr.name: attr for attr in self.attributes}
+        for det_names, dep_names in _EXAMPLE_FDS:
+            self.add_functional_dependency([attrs_by_name[name] for name in det_names],
+                                           [attrs_by_name[name] for name in dep_names])
 
         # (КодСотрудника, КодПроекта) -> Часы (Если бы был атрибут Часы, для примера)
         # Допустим, у нас нет атрибута "Часы", но для полноты картины, как бы это выглядело:
@@ -1383,62 +1988,35 @@ class NormalizationGUI:
         # self.attr_type_var.set("INTEGER")
         # self.is_pk_var.set(False)
         # self.add_attribute()
-        # set_fd_checkboxes_by_name(["КодСотрудника", "КодПроекта"], ["ЧасыРаботы"])
-        # self.add_functional_dependency()
-
-
-        messagebox.showinfo("Пример загружен",
-                            "Загружен пример отношения. \n"
-                            "Возможные нарушения: \n"
-                            "- 2НФ, если (КодСотрудника, КодПроекта) ключ, а есть зависимости от частей ключа.\n"
-                            "- 3НФ из-за транзитивной зависимости Отдел -> НачальникОтдела (КодСотрудника -> Отдел -> НачальникОтдела).")
+        # attrs_by_name = {attr.name: attr for attr in self.attributes}
+        # self.add_functional_dependency([attrs_by_name["КодСотрудника"], attrs_by_name["КодПроекта"]],
+        #                                [attrs_by_name["ЧасыРаботы"]])
 
 
     def show_about(self):
         """Отображение информации о программе"""
-        about_text = """Программа автоматической нормализации реляционных БД
+        messagebox.showinfo("О программе", _ABOUT_TEXT)
 
-Версия: 1.1
-Автор: Зуев Тимофей, ИУ7-85Б ()
-
-Программа позволяет:
-- Вводить атрибуты и функциональные зависимости
-- Анализировать нормальные формы отношений (1НФ, 2НФ, 3НФ, НФБК, 4НФ)
-- Выполнять декомпозицию в 2НФ, 3НФ, НФБК и 4НФ
-- Проверять сохранение функциональных зависимостей
-- Генерировать SQL DDL для результирующих отношений
-- Визуализировать схемы отношений (исходное и результат декомпозиции)
 
-Используемые алгоритмы:
-- Алгоритм синтеза для 3НФ
-- Алгоритм декомпозиции для НФБК
-- Вычисление замыкания атрибутов
-- Поиск минимального покрытия ФЗ
-- Алгоритмы проверки нормальных форм"""
+def _configure_styles(style: ttk.Style):
+    """Выбор темы и настройка стилей приложения (один раз на интерпретатор Tk)"""
+    # Первая доступная из стандартных тем: 'clam' обычно выглядит неплохо.
+    # Если нет ни одной, остается тема по умолчанию
+    themes = set(style.theme_names())
+    for theme in ('clam', 'alt'):
+        if theme in themes:
+            style.theme_use(theme)
+            break
 
-        messagebox.showinfo("О программе", about_text)
+    style.configure('Accent.TButton', foreground='white', background='#007bff', relief="raised")
+    style.map('Accent.TButton', background=[('active', '#0056b3')])
 
 
 def main():
     """Главная функция"""
     root = tk.Tk()
 
-    style = ttk.Style()
-    # Попробуем стандартные темы, если 'clam' доступна, она обычно выглядит неплохо
-    try:
-        style.theme_use('clam')
-    except tk.TclError:
-        try:
-            style.theme_use('alt')
-        except tk.TclError:
-            pass # Используем тему по умолчанию, если другие недоступны
-
-    style.configure('Accent.TButton', foreground='white', background='#007bff', relief="raised")
-    style.map('Accent.TButton', background=[('active', '#0056b3')])
-
-
-    # MODIFIED: Применяем патч для добавления функционала визуализации
-    add_visualization_to_gui(NormalizationGUI)
+    _configure_styles(ttk.Style(root))
 
     app = NormalizationGUI(root)
     root.mainloop()
@@ -37,52 +37,83 @@
 ДАТА: 2024
 """
 
+import io
 import psycopg2
-from typing import Dict, List, Tuple
+from psycopg2.extras import execute_values
+from typing import Dict, List, Tuple, Optional
 import matplotlib.pyplot as plt
 import numpy as np
-import random
 
 from models import Relation, NormalForm, Attribute, FunctionalDependency
-from data_test import connect, drop_table_if_exists, create_table, insert_random_data, create_and_populate_normalized, \
+from data_test import connect, create_table, insert_random_data, create_and_populate_normalized, \
     count_rows, sql_type_for
 from decomposition import Decomposer
 from analyzer import NormalFormAnalyzer
 
 
-def get_table_size_info(conn, table_name: str) -> Dict[str, int]:
+# Экранирование текстового формата COPY: обратный слэш, табуляция и переводы строк
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_field(value) -> str:
+    """Значение поля в текстовом формате COPY"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def get_table_size_info(conn, table_name: str, exact_rows: bool = False) -> Dict[str, int]:
     """
     Получить информацию о размере таблицы и её индексов в PostgreSQL.
+    Число строк — оценка pg_class.reltuples, обновляемая здесь же через ANALYZE;
+    exact_rows=True считает строки через COUNT(*).
     """
     with conn.cursor() as cur:
-        query = f"""
+        if not exact_rows:
+            # Без ANALYZE у только что заполненной таблицы reltuples = -1
+            cur.execute(f"ANALYZE {table_name}")
+        # Имя таблицы передается параметром, текст запроса одинаков для всех таблиц.
+        # Полный размер не запрашивается отдельно: pg_total_relation_size — это
+        # та же сумма pg_table_size и pg_indexes_size, посчитанная сервером заново
+        query = """
             SELECT 
-                pg_table_size('{table_name}') as table_size,
-                pg_indexes_size('{table_name}') as indexes_size,
-                pg_total_relation_size('{table_name}') as total_size,
-                (SELECT COUNT(*) FROM {table_name}) as row_count
+                pg_table_size(c.oid) as table_size,
+                pg_indexes_size(c.oid) as indexes_size,
+                c.reltuples::bigint as row_count
+            FROM pg_class c
+            WHERE c.oid = %s::regclass
         """
-        cur.execute(query)
+        cur.execute(query, (table_name,))
         result = cur.fetchone()
         if result:
-            table_size, indexes_size, total_size, row_count = result
+            table_size, indexes_size, row_count = result
+            table_size = table_size or 0
+            indexes_size = indexes_size or 0
+            if exact_rows:
+                cur.execute(f"SELECT COUNT(*) FROM {table_name}")
+                row_count = cur.fetchone()[0]
             return {
-                'table_size': table_size or 0,
-                'indexes_size': indexes_size or 0,
-                'total_size': total_size or 0,
-                'row_count': row_count or 0
+                'table_size': table_size,
+                'indexes_size': indexes_size,
+                'total_size': table_size + indexes_size,
+                'row_count': max(row_count or 0, 0)
             }
     return {'table_size': 0, 'indexes_size': 0, 'total_size': 0, 'row_count': 0}
 
 
-def create_realistic_indexes(conn, relation: Relation):
+def create_realistic_indexes(conn, relation: Relation, analyzer: Optional[NormalFormAnalyzer] = None):
     """
     Создает реалистичные индексы для отношения:
     1. Пытается добавить PRIMARY KEY для первого кандидатного ключа.
     2. Создает обычные индексы для полей, которые вероятно являются внешними ключами.
+    Готовый analyzer отношения избавляет от повторного поиска ключей.
     """
-    analyzer = NormalFormAnalyzer(relation)
-    pk_created = False
+    if analyzer is None:
+        analyzer = NormalFormAnalyzer(relation)
+    # Столбцы созданного PRIMARY KEY: для них отдельные индексы не нужны
+    pk_col_names = frozenset()
 
     with conn.cursor() as cur:
         # 1. Попытка создать первичный ключ
@@ -94,7 +125,7 @@ def create_realistic_indexes(conn, relation: Relation):
             try:
                 cur.execute(f"ALTER TABLE {relation.name} ADD PRIMARY KEY ({', '.join(pk_cols)})")
                 print(f"  [INDEX] Создан PRIMARY KEY для {relation.name} на ({', '.join(pk_cols)})")
-                pk_created = True
+                pk_col_names = frozenset(pk_cols)
             except psycopg2.Error as e:
                 # Если данные не уникальны, PK создать не получится. Это нормально для теста.
                 # Откатываем транзакцию, чтобы продолжить.
@@ -111,8 +142,6 @@ def create_realistic_indexes(conn, relation: Relation):
 
         # 2. Создание индексов для потенциальных внешних ключей
         # Простая эвристика: индексируем целочисленные поля, не входящие в PK
-        pk_col_names = {attr.name for attr in (pk_candidate if pk_created else [])}
-
         for attr in relation.attributes:
             if attr.name not in pk_col_names and "int" in attr.data_type.lower():
                 try:
@@ -133,9 +162,7 @@ def create_highly_redundant_data(conn, rel: Relation, num_rows: int) -> float:
     print(f"[INFO] Создание {num_rows} строк с высокой избыточностью...")
     print(f"[CREATE_DATA] Отношение: {rel.name}, атрибуты: {[attr.name for attr in rel.attributes]}")
     
-    # Создаем таблицу
-    print(f"[CREATE_DATA] Удаление существующей таблицы {rel.name}...")
-    drop_table_if_exists(conn, rel.name)
+    # Таблица пересоздается в одной транзакции с загрузкой данных (см. ниже)
     columns_def = []
     for attr in rel.attributes:
         col_def = f"{attr.name} {sql_type_for(attr)}"
@@ -143,21 +170,13 @@ def create_highly_redundant_data(conn, rel: Relation, num_rows: int) -> float:
             col_def += " NOT NULL"
         columns_def.append(col_def)
 
-    # Добавляем первичный ключ
+    # Первичный ключ добавляется после загрузки: индекс строится одной сортировкой,
+    # а не поддерживается при вставке каждой строки
     pk_attrs = [attr.name for attr in rel.attributes if attr.is_primary_key]
-    pk_clause = ""
-    if pk_attrs:
-        pk_list = ", ".join(pk_attrs)
-        pk_clause = f", PRIMARY KEY ({pk_list})"
 
-    ddl = f"CREATE TABLE {rel.name} (\n    " + ",\n    ".join(columns_def) + pk_clause + "\n);"
+    ddl = f"CREATE TABLE {rel.name} (\n    " + ",\n    ".join(columns_def) + "\n);"
     
-    print(f"[CREATE_DATA] Создание таблицы {rel.name}...")
     print(f"[CREATE_DATA] DDL: {ddl}")
-    with conn.cursor() as cur:
-        cur.execute(ddl)
-    conn.commit()
-    print(f"[CREATE_DATA] Таблица {rel.name} создана")
     
     # Предопределенные наборы значений для высокой избыточности
     departments = ["ИТ", "Финансы", "HR", "Маркетинг", "Продажи"]
@@ -185,146 +204,163 @@ def create_highly_redundant_data(conn, rel: Relation, num_rows: int) -> float:
     grades = [2, 3, 4, 5]
     quantities = [1, 2, 3, 5, 10]
     
-    # Функция для генерации значения с высокой избыточностью
-    def generate_redundant_value(attr: Attribute, row_id: int):
-        dt = attr.data_type.upper()
-        attr_lower = attr.name.lower()
-        
-        # Для первичных ключей обеспечиваем уникальность
-        if attr.is_primary_key:
-            if dt == "INTEGER":
-                return row_id
-            elif dt.startswith("VARCHAR"):
-                return f"key_{row_id}"
-            else:
-                return row_id
-        
+    # Набор значений неключевого поля с высокой избыточностью;
+    # значения всех строк выбираются из него равновероятно
+    def redundant_value_pool(dt: str, attr_lower: str) -> list:
         # Для неключевых полей создаем избыточность на основе имени атрибута
         if dt == "INTEGER":
             if any(word in attr_lower for word in ["отдел", "департамент"]):
-                return random.randint(1, len(departments))
+                return list(range(1, len(departments) + 1))
             elif any(word in attr_lower for word in ["проект", "курс"]):
-                return random.randint(1, len(projects if "проект" in attr_lower else courses))
+                return list(range(1, len(projects if "проект" in attr_lower else courses) + 1))
             elif any(word in attr_lower for word in ["клиент", "заказчик"]):
-                return random.randint(1, len(clients))
+                return list(range(1, len(clients) + 1))
             elif any(word in attr_lower for word in ["товар", "продукт"]):
-                return random.randint(1, len(products))
+                return list(range(1, len(products) + 1))
             elif any(word in attr_lower for word in ["оценка", "балл"]):
-                return random.choice(grades)
+                return grades
             elif any(word in attr_lower for word in ["количество", "кол"]):
-                return random.choice(quantities)
+                return quantities
             else:
-                return random.randint(1, 8)
+                return list(range(1, 9))
                 
         elif dt.startswith("VARCHAR"):
             if any(word in attr_lower for word in ["отдел", "департамент"]):
-                return random.choice(departments)
+                return departments
             elif "проект" in attr_lower and any(word in attr_lower for word in ["название", "наименование"]):
-                return random.choice(projects)
+                return projects
             elif "курс" in attr_lower and any(word in attr_lower for word in ["название", "наименование"]):
-                return random.choice(courses)
+                return courses
             elif any(word in attr_lower for word in ["имя", "фио"]) and any(word in attr_lower for word in ["сотрудник", "работник"]):
-                return random.choice(employee_names)
+                return employee_names
             elif any(word in attr_lower for word in ["имя", "фио"]) and any(word in attr_lower for word in ["студент", "учащийся"]):
-                return random.choice(student_names)
+                return student_names
             elif any(word in attr_lower for word in ["имя", "название"]) and any(word in attr_lower for word in ["клиент", "заказчик"]):
-                return random.choice(clients)
+                return clients
             elif any(word in attr_lower for word in ["начальник", "руководитель", "менеджер", "куратор"]):
-                return random.choice(managers)
+                return managers
             elif any(word in attr_lower for word in ["преподаватель", "учитель", "лектор"]):
-                return random.choice(teachers)
+                return teachers
             elif any(word in attr_lower for word in ["товар", "продукт"]) and any(word in attr_lower for word in ["название", "наименование"]):
-                return random.choice(products)
+                return products
             elif any(word in attr_lower for word in ["категория", "тип"]):
-                return random.choice(categories)
+                return categories
             elif any(word in attr_lower for word in ["город", "населенный"]):
-                return random.choice(cities)
+                return cities
             elif any(word in attr_lower for word in ["группа", "класс"]):
-                return random.choice(groups)
+                return groups
             else:
                 # Общий случай - ограниченный набор значений
-                return f"Значение_{random.randint(1, 6)}"
+                return [f"Значение_{i}" for i in range(1, 7)]
                 
         elif dt == "DECIMAL":
             if any(word in attr_lower for word in ["бюджет", "стоимость"]):
-                return random.choice(budgets)
+                return budgets
             elif any(word in attr_lower for word in ["цена", "стоимость"]):
-                return random.choice(prices)
+                return prices
             else:
-                return random.choice([100.50, 250.00, 500.75, 1000.00, 1500.25])
+                return [100.50, 250.00, 500.75, 1000.00, 1500.25]
                 
         elif dt == "DATE":
             import datetime
-            base_dates = [
+            return [
                 datetime.date(2023, 1, 15),
                 datetime.date(2023, 3, 20),
                 datetime.date(2023, 6, 10),
                 datetime.date(2023, 9, 5),
                 datetime.date(2023, 12, 1)
             ]
-            return random.choice(base_dates)
             
         elif dt == "BOOLEAN":
-            return random.choice([True, False])
+            return [True, False]
         
         # По умолчанию
-        return f"Общее_значение_{random.randint(1, 5)}"
+        return [f"Общее_значение_{i}" for i in range(1, 6)]
+    
+    # Значения генерируются целыми столбцами: один вызов генератора NumPy
+    # на атрибут вместо вызова random на каждое поле каждой строки
+    rng = np.random.default_rng()
+    row_ids = range(1, num_rows + 1)
+
+    # Для первичных ключей обеспечиваем уникальность номером строки
+    def key_column(dt: str) -> list:
+        if dt.startswith("VARCHAR"):
+            return [f"key_{row_id}" for row_id in row_ids]
+        return list(row_ids)
+
+    # Столбцы в виде готовых полей COPY
+    copy_columns = []
+    # Источники значений (тип, набор, индексы) — типизированные столбцы нужны
+    # только запасному пути через INSERT и строятся лишь в нем; набор None у ключа
+    column_sources = []
+    for attr in rel.attributes:
+        # Тип и имя нормализуются один раз на атрибут
+        dt = attr.data_type.upper()
+        if attr.is_primary_key:
+            copy_columns.append(list(map(_copy_field, key_column(dt))))
+            column_sources.append((dt, None, None))
+        else:
+            pool = redundant_value_pool(dt, attr.name.lower())
+            indices = rng.integers(0, len(pool), size=num_rows)
+            # Значения набора форматируются один раз, а не в каждой строке
+            copy_pool = np.array([_copy_field(value) for value in pool], dtype=object)
+            copy_columns.append(copy_pool[indices].tolist())
+            column_sources.append((dt, pool, indices))
     
     # Генерируем данные с обеспечением уникальности первичных ключей
     cols = [attr.name for attr in rel.attributes]
     col_list = ", ".join(cols)
-    placeholders = ", ".join(["%s"] * len(cols))
-    insert_sql = f"INSERT INTO {rel.name} ({col_list}) VALUES ({placeholders});"
-    
-    pk_attrs = [attr for attr in rel.attributes if attr.is_primary_key]
-    used_pk_values = set()
-    
-    print(f"[CREATE_DATA] Начало вставки данных...")
+    copy_sql = f"COPY {rel.name} ({col_list}) FROM STDIN"
+    
+    # Строки собираются в буфер и уходят на сервер одним COPY
+    # вместо отдельного INSERT на каждую строку.
+    # Каждый ключевой столбец строится из номера строки (row_id или key_{row_id}),
+    # поэтому комбинации PK уникальны по построению и проверять дубликаты не нужно
+    buf = io.StringIO()
+    inserted_rows = num_rows if copy_columns else 0
+    
+    # Прогресс сообщается только до и после: в цикле по строкам нет проверок и вывода
+    print(f"[CREATE_DATA] Сборка {inserted_rows} строк...")
+    buf.writelines("\t".join(fields) + "\n" for fields in zip(*copy_columns))
+    
+    print(f"[CREATE_DATA] Пересоздание таблицы {rel.name} и загрузка данных через COPY...")
+    buf.seek(0)
+    # Удаление, создание, загрузка и PK — одна транзакция с одним коммитом.
+    # Данные тестовые, поэтому коммит не ждет сброса WAL на диск
     with conn.cursor() as cur:
-        inserted_rows = 0
-        attempts = 0
-        max_attempts = num_rows * 3  # Ограничиваем количество попыток
-        
-        while inserted_rows < num_rows and attempts < max_attempts:
-            attempts += 1
-            
-            # Генерируем значения для всех атрибутов
-            values = []
-            for attr in rel.attributes:
-                value = generate_redundant_value(attr, inserted_rows + 1)
-                values.append(value)
-            
-            # Проверяем уникальность первичного ключа
-            if pk_attrs:
-                pk_indices = [rel.attributes.index(pk_attr) for pk_attr in pk_attrs]
-                pk_tuple = tuple(values[i] for i in pk_indices)
-                
-                if pk_tuple in used_pk_values:
-                    continue  # Пропускаем дубликат
-                    
-                used_pk_values.add(pk_tuple)
-            
-            cur.execute(insert_sql, values)
-            inserted_rows += 1
-            
-            # Логируем прогресс
-            if inserted_rows % 1000 == 0 or inserted_rows == num_rows:
-                print(f"[CREATE_DATA] Вставлено {inserted_rows}/{num_rows} строк...")
-    
+        cur.execute("SET LOCAL synchronous_commit = OFF")
+        cur.execute(f"DROP TABLE IF EXISTS {rel.name} CASCADE;")
+        cur.execute(ddl)
+        cur.execute("SAVEPOINT copy_load")
+        try:
+            cur.copy_expert(copy_sql, buf)
+        except psycopg2.NotSupportedError as e:
+            # COPY запрещен (например, прокси соединений): многострочные INSERT
+            # по 1000 строк вместо отдельного запроса на каждую строку
+            cur.execute("ROLLBACK TO SAVEPOINT copy_load")
+            print(f"[CREATE_DATA] COPY недоступен ({e}), загрузка через execute_values...")
+            columns = [key_column(dt) if pool is None else np.array(pool, dtype=object)[indices].tolist()
+                       for dt, pool, indices in column_sources]
+            execute_values(cur, f"INSERT INTO {rel.name} ({col_list}) VALUES %s",
+                           zip(*columns), page_size=1000)
+        if pk_attrs:
+            cur.execute(f"ALTER TABLE {rel.name} ADD PRIMARY KEY ({', '.join(pk_attrs)})")
     conn.commit()
     print(f"[INFO] Создано {inserted_rows} строк")
-    print(f"[CREATE_DATA] Всего попыток: {attempts}, успешных вставок: {inserted_rows}")
     
     # Вычисляем статистику избыточности
     total_redundancy = 0
     redundancy_count = 0
     
-    with conn.cursor() as cur:
-        non_pk_attrs = [attr for attr in rel.attributes if not attr.is_primary_key]
+    non_pk_attrs = [attr for attr in rel.attributes if not attr.is_primary_key]
+    if non_pk_attrs:
+        # Все счетчики одним запросом: один проход по таблице вместо запроса на столбец
+        projections = ", ".join(f'COUNT(DISTINCT "{attr.name}")' for attr in non_pk_attrs)
+        with conn.cursor() as cur:
+            cur.execute(f"SELECT {projections} FROM {rel.name}")
+            unique_counts = cur.fetchone()
         
-        for attr in non_pk_attrs:
-            cur.execute(f'SELECT COUNT(DISTINCT "{attr.name}") FROM {rel.name}')
-            unique_count = cur.fetchone()[0]
+        for attr, unique_count in zip(non_pk_attrs, unique_counts):
             if unique_count > 0:
                 field_redundancy = inserted_rows / unique_count
                 total_redundancy += field_redundancy
@@ -343,10 +379,13 @@ def create_highly_redundant_data(conn, rel: Relation, num_rows: int) -> float:
 
 def run_memory_test(
         orig_rel: Relation,
-        num_rows: int = 10000
+        num_rows: int = 10000,
+        exact_join_count: bool = False
 ) -> Dict[str, Dict[str, any]]:
     """
     Тестирование использования памяти с высокой избыточностью.
+    Число строк после JOIN по умолчанию — оценка планировщика;
+    exact_join_count=True выполняет соединение и считает строки точно.
     """
     print(f"[MEMORY_TEST] Начало функции run_memory_test с {num_rows} строками")
     
@@ -371,8 +410,11 @@ def run_memory_test(
         redundancy_coeff = create_highly_redundant_data(conn, orig_rel, num_rows)
         print(f"[MEMORY_TEST] Данные созданы, коэффициент избыточности: {redundancy_coeff:.1f}x")
         
+        # Анализатор исходного отношения нужен и для индексов, и для выбора уровней
+        analyzer = NormalFormAnalyzer(orig_rel)
+
         print(f"[MEMORY_TEST] Создание индексов...")
-        create_realistic_indexes(conn, orig_rel)  # Создаем индексы и PK
+        create_realistic_indexes(conn, orig_rel, analyzer)  # Создаем индексы и PK
         print(f"[MEMORY_TEST] Индексы созданы")
 
         print(f"[MEMORY_TEST] Получение информации о размере таблицы...")
@@ -385,7 +427,6 @@ def run_memory_test(
 
         # 2. ОПРЕДЕЛЕНИЕ НОРМАЛЬНОЙ ФОРМЫ
         print(f"[MEMORY_TEST] Анализ нормальной формы...")
-        analyzer = NormalFormAnalyzer(orig_rel)
         current_nf, _ = analyzer.determine_normal_form()
         print(f"\n[INFO] Исходная нормальная форма: {current_nf.value}")
 
@@ -457,6 +498,7 @@ def run_memory_test(
                     
                     join_clause = main_table.name
                     main_attrs = set(attr.name for attr in main_table.attributes)
+                    joinable = True
                     
                     for rel in other_tables:
                         rel_attrs = set(attr.name for attr in rel.attributes)
@@ -468,15 +510,27 @@ def run_memory_test(
                                 join_conditions.append(f"{main_table.name}.{attr_name} = {rel.name}.{attr_name}")
                             join_clause += f" JOIN {rel.name} ON {' AND '.join(join_conditions)}"
                         else:
-                            # Если нет общих атрибутов, используем CROSS JOIN
-                            join_clause += f" CROSS JOIN {rel.name}"
-                            print(f"  [WARNING] Нет общих атрибутов между {main_table.name} и {rel.name}")
+                            # CROSS JOIN дал бы произведение размеров таблиц,
+                            # поэтому целостность такого уровня не проверяется
+                            print(f"  [WARNING] Нет общих атрибутов между {main_table.name} и {rel.name}, "
+                                  f"проверка JOIN пропущена")
+                            joinable = False
+                            break
 
                     # Проверяем количество строк после JOIN
                     try:
-                        cur.execute(f"SELECT COUNT(*) FROM {join_clause}")
-                        join_count = cur.fetchone()[0]
-                        print(f"  [INFO] Количество строк после JOIN: {join_count}")
+                        if not joinable:
+                            join_count = -1  # Непроверяемо
+                        elif exact_join_count:
+                            cur.execute(f"SELECT COUNT(*) FROM {join_clause}")
+                            join_count = cur.fetchone()[0]
+                            print(f"  [INFO] Количество строк после JOIN: {join_count}")
+                        else:
+                            # Оценка планировщика: соединение не выполняется
+                            cur.execute(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {join_clause}")
+                            plan = cur.fetchone()[0]
+                            join_count = int(plan[0]["Plan"]["Plan Rows"])
+                            print(f"  [INFO] Оценка количества строк после JOIN: {join_count}")
                     except Exception as e:
                         print(f"  [WARNING] Ошибка при выполнении JOIN: {e}")
                         # Попробуем простой подсчет без JOIN
@@ -567,12 +621,10 @@ def plot_memory_usage(results: Dict[str, Dict[str, any]]):
     # --- График 2: Количество строк с трендом ---
     ax2 = plt.subplot(2, 3, 2)
     
-    # Используем разную штриховку для каждого уровня
-    bars = []
-    for i, count in enumerate(row_counts):
-        bar = ax2.bar(i, count, color='white', edgecolor='black', 
-                     hatch=hatches[i % len(hatches)])
-        bars.append(bar)
+    # Все столбцы одним вызовом; разная штриховка для каждого уровня
+    bars = ax2.bar(x, row_counts, color='white', edgecolor='black')
+    for i, bar in enumerate(bars):
+        bar.set_hatch(hatches[i % len(hatches)])
     
     # Добавляем линию тренда
     ax2.plot(range(len(levels)), row_counts, 'ko-', linewidth=2, markersize=6)
@@ -585,23 +637,18 @@ def plot_memory_usage(results: Dict[str, Dict[str, any]]):
 
     # Добавляем процентное изменение
     original_rows = row_counts[0] if row_counts else 0
-    for i, (bar, count) in enumerate(zip(bars, row_counts)):
-        height = bar[0].get_height()
-        if i == 0:
-            label = f'{count:,}'
-        else:
-            change = ((count - original_rows) / original_rows * 100) if original_rows > 0 else 0
-            label = f'{count:,}\n({change:+.1f}%)'
-        ax2.text(i, height, label.replace(',', ' '),
-                ha='center', va='bottom', fontsize=9, fontweight='bold')
+    row_labels = [f'{row_counts[0]:,}']
+    for count in row_counts[1:]:
+        change = ((count - original_rows) / original_rows * 100) if original_rows > 0 else 0
+        row_labels.append(f'{count:,}\n({change:+.1f}%)')
+    ax2.bar_label(bars, labels=[label.replace(',', ' ') for label in row_labels],
+                  fontsize=9, fontweight='bold')
 
     # --- График 3: Сложность схемы ---
     ax3 = plt.subplot(2, 3, 3)
-    bars = []
-    for i, count in enumerate(table_counts):
-        bar = ax3.bar(i, count, color='white', edgecolor='black', 
-                     hatch=hatches[i % len(hatches)])
-        bars.append(bar)
+    bars = ax3.bar(x, table_counts, color='white', edgecolor='black')
+    for i, bar in enumerate(bars):
+        bar.set_hatch(hatches[i % len(hatches)])
         
     ax3.set_ylabel('Количество таблиц', fontsize=12)
     ax3.set_title('Сложность схемы', fontsize=14, pad=15)
@@ -610,10 +657,8 @@ def plot_memory_usage(results: Dict[str, Dict[str, any]]):
     ax3.grid(True, axis='y', linestyle='--', alpha=0.6)
     ax3.yaxis.set_major_locator(plt.MaxNLocator(integer=True))
 
-    for i, bar in enumerate(bars):
-        height = bar[0].get_height()
-        ax3.text(i, height, f'{int(height)}',
-                ha='center', va='bottom', fontsize=11, fontweight='bold')
+    ax3.bar_label(bars, labels=[f'{int(count)}' for count in table_counts],
+                  fontsize=11, fontweight='bold')
 
     # --- График 4: Эффективность нормализации ---
     ax4 = plt.subplot(2, 3, 4)
@@ -629,16 +674,12 @@ def plot_memory_usage(results: Dict[str, Dict[str, any]]):
         efficiency.append(eff)
         efficiency_labels.append(f'{eff:.1f}%')
 
-    # Используем разную штриховку для положительных и отрицательных значений
-    bars = []
-    for i, eff in enumerate(efficiency):
-        if eff >= 0:
-            # Положительная эффективность - диагональная штриховка
-            bar = ax4.bar(i, eff, color='white', edgecolor='black', hatch='///')
-        else:
-            # Отрицательная эффективность - обратная диагональная штриховка
-            bar = ax4.bar(i, eff, color='lightgray', edgecolor='black', hatch='\\\\\\')
-        bars.append(bar)
+    # Используем разную штриховку для положительных и отрицательных значений:
+    # положительная эффективность - диагональная, отрицательная - обратная диагональная
+    bars = ax4.bar(x, efficiency, edgecolor='black',
+                   color=['white' if eff >= 0 else 'lightgray' for eff in efficiency])
+    for bar, eff in zip(bars, efficiency):
+        bar.set_hatch('///' if eff >= 0 else '\\\\\\')
         
     ax4.set_ylabel('Экономия размера (%)', fontsize=12)
     ax4.set_title('Эффективность нормализации', fontsize=14, pad=15)
@@ -648,7 +689,7 @@ def plot_memory_usage(results: Dict[str, Dict[str, any]]):
     ax4.axhline(y=0, color='black', linestyle='-', alpha=0.8)
 
     for i, (bar, label) in enumerate(zip(bars, efficiency_labels)):
-        height = bar[0].get_height()
+        height = bar.get_height()
         ax4.text(i, height + (1 if height >= 0 else -3), 
                 label, ha='center', va='bottom' if height >= 0 else 'top', 
                 fontsize=10, fontweight='bold')
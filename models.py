@@ -3,6 +3,7 @@
 """
 from typing import List, Set, Tuple, Optional
 from dataclasses import dataclass, field
+from functools import cached_property
 from enum import Enum
 
 
@@ -40,11 +41,19 @@ class FunctionalDependency:
     """Класс для представления функциональной зависимости"""
     determinant: Set[Attribute]
     dependent: Set[Attribute]
+    _repr_cache: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     def __repr__(self):
+        cached = self._repr_cache
+        if cached is not None:
+            return cached
         det_str = ", ".join([attr.name for attr in self.determinant])
         dep_str = ", ".join([attr.name for attr in self.dependent])
-        return f"{{{det_str}}} → {{{dep_str}}}"
+        text = f"{{{det_str}}} → {{{dep_str}}}"
+        # Обычные множества могут дополняться на месте, поэтому кэшируется только ФЗ из frozenset
+        if isinstance(self.determinant, frozenset) and isinstance(self.dependent, frozenset):
+            self._repr_cache = text
+        return text
 
     def is_trivial(self) -> bool:
         """Проверка, является ли ФЗ тривиальной"""
@@ -93,6 +102,11 @@ class Relation:
         """Получаем все атрибуты как множество"""
         return set(self.attributes)
 
+    @cached_property
+    def attr_names_csv(self) -> str:
+        """Имена атрибутов через запятую (вычисляется один раз)"""
+        return ", ".join(attr.name for attr in self.attributes)
+
     def __repr__(self):
         attrs_str = ", ".join([attr.name for attr in self.attributes])
         return f"{self.name}({attrs_str})"